@@ -1,41 +1,45 @@
 import argparse
-import json
+import ctypes
+import ctypes.util
+import functools
+import hashlib
+import os
 import pathlib
+import pkgutil
+import pprint
 import shutil
 import sys
+import PyInstaller
 import PyInstaller.__main__ as pyi
+import PyQt6
 
 MIN_COVERAGE = 70
 FILE_PATH = pathlib.Path(__file__).resolve()
 PROJECT_PATH = FILE_PATH.parent
 INSTALLER_PATH = PROJECT_PATH / 'installer'
+DEPENDENCY_FILES = [PROJECT_PATH / 'environment.yaml', PROJECT_PATH / 'requirements.txt']
+PYQT_MODULES = {'Qsci', 'QtCore', 'QtGui', 'QtOpenGL', 'QtOpenGLWidgets', 'QtPrintSupport', 'QtWidgets', 'sip'}
 EXCLUDED_IMPORT = [
     '--exclude-module', 'coverage', '--exclude-module', 'jedi', '--exclude-module', 'tkinter', '--exclude-module',
-    'IPython', '--exclude-module', 'lib2to3', '--exclude-module', 'PyQt6.QtDBus', '--exclude-module',
-    'PyQt6.QtDesigner', '--exclude-module', 'PyQt6.QtBluetooth', '--exclude-module', 'PyQt6.QtNetwork',
-    '--exclude-module', 'PyQt6.QtNfc', '--exclude-module', 'PyQt6.QtWebChannel', '--exclude-module',
-    'PyQt6.QtWebEngine', '--exclude-module', 'PyQt6.QtWebEngineCore', '--exclude-module', 'PyQt6.QtWebEngineWidgets',
-    '--exclude-module', 'PyQt6.QtWebKit', '--exclude-module', 'PyQt6.QtWebKitWidgets', '--exclude-module',
-    'PyQt6.QtWebSockets', '--exclude-module', 'PyQt6.QtTest', '--exclude-module', 'PyQt6.QtTextToSpeech',
-    '--exclude-module', 'PyQt6.QtWinExtras', '--exclude-module', 'PyQt6.QtLocation', '--exclude-module',
-    'PyQt6.QtMultimediaWidgets', '--exclude-module', 'PyQt6.QtNetworkAuth', '--exclude-module', 'PyQt6.QtPositioning',
-    '--exclude-module', 'PyQt6.QtQuick', '--exclude-module', 'PyQt6.QtQuick3D', '--exclude-module', 'PyQt6.QtSensors',
-    '--exclude-module', 'PyQt6.QtRemoteObjects', '--exclude-module', 'PyQt6.QtMultimedia', '--exclude-module',
-    'PyQt6.QtQml', '--exclude-module', 'PyQt6.QtQuickWidgets', '--exclude-module', 'PyQt6.QtSql', '--exclude-module',
-    'PyQt6.QtSvg', '--exclude-module', 'PyQt6.QtSerialPort', '--exclude-module', 'PyQt6.QtNetwork', '--exclude-module',
-    'PyQt6.QtScript', '--exclude-module', 'PyQt6.QtXml', '--exclude-module', 'PyQt6.QtXmlPatterns', '--exclude-module',
-    'sphinx', '--exclude-module', 'numpy.array_api', '--exclude-module', 'pkg_resources'
+    'IPython', '--exclude-module', 'lib2to3', '--exclude-module', 'sphinx', '--exclude-module', 'numpy.array_api',
+    '--exclude-module', 'pkg_resources'
 ]
+# Exclude every installed PyQt6 module that is not used by the application
+for module in pkgutil.iter_modules(PyQt6.__path__):
+    if module.name not in PYQT_MODULES:
+        EXCLUDED_IMPORT.extend(['--exclude-module', f'PyQt6.{module.name}'])
 HIDDEN_IMPORT = ['--hidden-import', 'OpenGL.platform.egl']
 IS_WINDOWS = sys.platform.startswith('win')
 IS_MAC = True if sys.platform == 'darwin' else False
 
 
-def format_code(check=False):
+def format_code(check=False, verify=False):
     """Formats the code with YAPF
 
     :param check: indicates the formatting should only be checked
     :type check: bool
+    :param verify: indicates the reformatted code should be verified by YAPF
+    :type verify: bool
     """
     try:
         from yapf import main as yapf_main
@@ -51,10 +55,13 @@ def format_code(check=False):
         msg = 'Reformatting with YAPF'
         yapf_args.extend(['--in-place', '--verbose'])
 
+    if verify:
+        yapf_args.append('--verify')
+
     print(msg)
     yapf_args.extend([
-        '--parallel', '--recursive', '--verify', '--exclude', '*__config_data.py', '--style', 'setup.cfg', 'docs',
-        'sscanss', 'tests', 'make.py'
+        '--parallel', '--recursive', '--exclude', '*__config_data.py', '--style', 'setup.cfg', 'docs', 'sscanss',
+        'tests', 'make.py'
     ])
     exit_code = yapf_main(yapf_args)
     if exit_code != 0:
@@ -74,7 +81,7 @@ def linting():
 
     print('Checking with PyLint')
     try:
-        pylint_main(['--rcfile', 'setup.cfg', '--score', 'false', 'sscanss'])
+        pylint_main(['--rcfile', 'setup.cfg', '--jobs', '0', '--score', 'false', 'sscanss'])
     except SystemExit as e:
         if e.code != 0:
             sys.exit(e.code)
@@ -96,9 +103,35 @@ def create_pre_commit_hook():
     print('Pre-commit hook installed successfully!')
 
 
-def run_tests_with_coverage():
-    """Runs units tests and checks coverages"""
+def run_test_module(module_name):
+    """Runs the unit tests in a test module with coverage. This is executed in a worker
+    process and the coverage data is saved in a separate file to be combined later
+
+    :param module_name: name of test module
+    :type module_name: str
+    :return: indicates tests were successful and the test output
+    :rtype: Tuple[bool, str]
+    """
+    import io
     import unittest
+    import coverage
+
+    cov = coverage.Coverage(source=['sscanss'], data_suffix=True)
+    cov.start()
+
+    stream = io.StringIO()
+    tests = unittest.TestLoader().loadTestsFromName(module_name)
+    result = unittest.TextTestRunner(stream=stream).run(tests)
+
+    cov.stop()
+    cov.save()
+
+    return result.wasSuccessful(), stream.getvalue()
+
+
+def run_tests_with_coverage():
+    """Runs units tests in parallel (one process per test module) and checks coverages"""
+    from concurrent.futures import ProcessPoolExecutor
 
     try:
         import coverage
@@ -107,18 +140,22 @@ def run_tests_with_coverage():
         sys.exit(-1)
 
     cov = coverage.Coverage(source=['sscanss'])
+    cov.set_option('run:parallel', True)
     cov.erase()
-    cov.start()
 
-    loader = unittest.TestLoader()
-    tests = loader.discover('tests')
-    test_runner = unittest.runner.TextTestRunner()
-    result = test_runner.run(tests)
+    module_names = [f'tests.{path.stem}' for path in sorted((PROJECT_PATH / 'tests').glob('test*.py'))]
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(run_test_module, module_names))
 
-    cov.stop()
+    success = True
+    for module_name, (module_success, output) in zip(module_names, results):
+        print(f'{module_name}\n{output}', file=sys.stderr)
+        success = success and module_success
+
+    cov.combine()
     cov.save()
 
-    if not result.wasSuccessful():
+    if not success:
         sys.exit(1)
 
     percentage = cov.html_report(omit=['*__init__*'])
@@ -129,18 +166,148 @@ def run_tests_with_coverage():
 
 
 def compile_log_config_and_schema():
-    """Writes log and instrument schema json into a python file as dictionaries"""
+    """Writes log and instrument schema json into a python file as dictionaries. The file is
+    only regenerated when the json files are newer and is not rewritten if the content is unchanged"""
     config_data_path = PROJECT_PATH / 'sscanss' / '__config_data.py'
+    log_config_path = PROJECT_PATH / 'sscanss' / 'logging.json'
+    schema_path = PROJECT_PATH / 'sscanss' / 'instrument_schema.json'
+
+    if config_data_path.is_file():
+        source_mtime = max(log_config_path.stat().st_mtime, schema_path.stat().st_mtime)
+        if config_data_path.stat().st_mtime >= source_mtime:
+            return
+
+    try:
+        from orjson import loads
+    except ImportError:
+        from json import loads
+
+    with open(log_config_path, 'rb') as log_file:
+        log_config = loads(log_file.read())
+
+    with open(schema_path, 'rb') as schema_file:
+        schema = loads(schema_file.read())
 
-    with open(PROJECT_PATH / 'sscanss' / 'logging.json', 'r') as log_file:
-        log_config = json.loads(log_file.read())
+    log_config = pprint.pformat(log_config, width=120, sort_dicts=True)
+    schema = pprint.pformat(schema, width=120, sort_dicts=True)
+    content = f'LOG_CONFIG = {log_config}\n\nSCHEMA = {schema}\n'
+    if config_data_path.is_file() and config_data_path.read_text() == content:
+        return
 
-    with open(PROJECT_PATH / 'sscanss' / 'instrument_schema.json', 'r') as schema_file:
-        schema = json.loads(schema_file.read())
+    temp_path = config_data_path.with_suffix('.tmp')
+    temp_path.write_text(content)
+    os.replace(temp_path, config_data_path)
 
-    with open(config_data_path, 'w') as f:
-        f.write(f'LOG_CONFIG = {log_config}\n\n')
-        f.write(f'SCHEMA = {schema}\n')
+
+@functools.lru_cache(maxsize=None)
+def get_clonefile():
+    """Resolves the macOS clonefile function once so it is not loaded for every copied file
+
+    :return: clonefile function or None if it is not available
+    :rtype: Union[ctypes._FuncPtr, None]
+    """
+    library = ctypes.util.find_library('System')
+    if library is None:
+        return None
+
+    try:
+        clonefile = ctypes.CDLL(library, use_errno=True).clonefile
+    except (OSError, AttributeError):
+        return None
+
+    clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+    clonefile.restype = ctypes.c_int
+    return clonefile
+
+
+def fast_copy(src, dst):
+    """Copies a file using a copy-on-write clone on macOS or an in-kernel copy on Linux, and
+    falls back to shutil.copy2 if these are not available
+
+    :param src: source file path
+    :type src: Union[str, pathlib.Path]
+    :param dst: destination file path
+    :type dst: Union[str, pathlib.Path]
+    :return: destination file path
+    :rtype: Union[str, pathlib.Path]
+    """
+    if IS_MAC:
+        clonefile = get_clonefile()
+        if clonefile is not None and clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+            return dst
+    elif hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+                remaining = os.fstat(src_file.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src_file.fileno(), dst_file.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return dst
+        except OSError:
+            pass
+
+    return shutil.copy2(src, dst)
+
+
+def prepare_work_path(work_path):
+    """Prepares the PyInstaller work directory. The cached analysis in the directory is kept between
+    builds and is only cleared when the excluded or hidden imports change.
+
+    :param work_path: path of PyInstaller work directory
+    :type work_path: pathlib.Path
+    """
+    signature = hashlib.sha256(repr((EXCLUDED_IMPORT, HIDDEN_IMPORT)).encode()).hexdigest()
+    signature_path = work_path / '.build_sig'
+
+    if signature_path.is_file() and signature_path.read_text() == signature:
+        return
+
+    shutil.rmtree(work_path, ignore_errors=True)
+    work_path.mkdir(parents=True)
+    signature_path.write_text(signature)
+
+
+def build_signature(pyi_args):
+    """Computes a signature for a build from the PyInstaller arguments, the build environment (Python and
+    PyInstaller versions and the dependency files) and the size and modification time of make.py and the
+    files in the sscanss package
+
+    :param pyi_args: PyInstaller arguments
+    :type pyi_args: List[str]
+    :return: build signature
+    :rtype: str
+    """
+    signature = hashlib.sha256(repr(pyi_args).encode())
+    signature.update(f'{sys.version}:{PyInstaller.__version__}'.encode())
+    for path in DEPENDENCY_FILES:
+        if path.is_file():
+            signature.update(path.read_bytes())
+
+    for path in sorted([FILE_PATH, *(PROJECT_PATH / 'sscanss').rglob('*')]):
+        if path.is_file() and '__pycache__' not in path.parts:
+            stat = path.stat()
+            signature.update(f'{path}:{stat.st_mtime_ns}:{stat.st_size}'.encode())
+
+    return signature.hexdigest()
+
+
+def is_build_current(signature_path, signature, output_path):
+    """Checks if the output of a previous build exists and was built with the same signature
+
+    :param signature_path: path of file containing the signature of the previous build
+    :type signature_path: pathlib.Path
+    :param signature: signature of the current build
+    :type signature: str
+    :param output_path: path of the build output
+    :type output_path: pathlib.Path
+    :return: indicates the previous build is current
+    :rtype: bool
+    """
+    return output_path.exists() and signature_path.is_file() and signature_path.read_text() == signature
 
 
 def build_editor():
@@ -152,8 +319,8 @@ def build_editor():
     pyi_args = [
         '--name', 'editor', '--specpath',
         str(work_path), '--workpath',
-        str(work_path), '--windowed', '--noconfirm', '--distpath',
-        str(dist_path), '--clean', '--log-level', 'ERROR',
+        str(work_path), '--windowed', '--onedir', '--noconfirm', '--distpath',
+        str(dist_path), '--log-level', 'ERROR',
         str(main_path)
     ]
 
@@ -165,13 +332,20 @@ def build_editor():
     icon = 'editor-logo.icns' if IS_MAC else 'editor-logo.ico'
     pyi_args.extend(['--icon', str(INSTALLER_PATH / 'icons' / icon)])
 
+    signature = build_signature(pyi_args)
+    signature_path = dist_path / '.editor_build_hash'
+    if is_build_current(signature_path, signature, dist_path / ('editor.app' if IS_MAC else 'editor')):
+        print('Skipping SScanSS editor build (no changes)\n')
+        return
+
     print('Building SScanSS editor with PyInstaller')
+    prepare_work_path(work_path)
     pyi.run(pyi_args)
-    shutil.rmtree(work_path)
 
     if IS_MAC:
         shutil.rmtree(INSTALLER_PATH / 'bundle' / 'editor')
 
+    signature_path.write_text(signature)
     print('SScanSS editor built with no errors!\n')
 
 
@@ -180,13 +354,12 @@ def build_sscanss():
     work_path = INSTALLER_PATH / 'temp'
     dist_path = INSTALLER_PATH / 'bundle' / 'app'
     main_path = PROJECT_PATH / 'sscanss' / 'app' / 'main.py'
-    shutil.rmtree(dist_path, ignore_errors=True)
 
     pyi_args = [
         '--name', 'sscanss', '--specpath',
         str(work_path), '--workpath',
-        str(work_path), '--windowed', '--noconfirm', '--distpath',
-        str(dist_path), '--clean', '--log-level', 'ERROR',
+        str(work_path), '--windowed', '--onedir', '--noconfirm', '--distpath',
+        str(dist_path), '--log-level', 'ERROR',
         str(main_path)
     ]
 
@@ -198,28 +371,32 @@ def build_sscanss():
     if IS_MAC:
         pyi_args.extend(['--icon', str(INSTALLER_PATH / 'icons' / 'logo.icns')])
 
+    signature = build_signature(pyi_args)
+    signature_path = INSTALLER_PATH / 'bundle' / '.sscanss_build_hash'
+    if is_build_current(signature_path, signature, dist_path):
+        print('Skipping SScanSS app build (no changes)\n')
+        return
+
+    shutil.rmtree(dist_path, ignore_errors=True)
     print('Building SScanSS app with PyInstaller')
+    prepare_work_path(work_path)
     pyi.run(pyi_args)
 
-    exec_folder = next(dist_path.iterdir())
+    # In onedir mode, PyInstaller writes the executable and an "_internal" folder into dist_path/sscanss
     if not IS_MAC:
-        exec_folder.rename(dist_path / 'bin')
-    shutil.rmtree(work_path)
+        (dist_path / 'sscanss').rename(dist_path / 'bin')
 
     # Copy resources into installer directory
-    style_sheet = 'static/mac_style.css' if IS_MAC else 'static/style.css'
-    resources = ['instruments', 'static/images', 'static/dark_theme.css', style_sheet]
+    style_sheet = 'style.css' if IS_MAC else 'mac_style.css'
+    ignore = shutil.ignore_patterns('__pycache__', style_sheet)
+    resource_path = dist_path / 'sscanss.app' / 'Contents' / 'Resources' if IS_MAC else dist_path
     shutil.copy(PROJECT_PATH / 'LICENSE', dist_path / 'LICENSE')
-    for resource in resources:
-        if IS_MAC:
-            dest_path = dist_path / 'sscanss.app' / 'Contents' / 'Resources' / resource
-        else:
-            dest_path = dist_path / resource
-        src_path = PROJECT_PATH / 'sscanss' / resource
-        if src_path.is_file():
-            shutil.copy(src_path, dest_path)
-        else:
-            shutil.copytree(src_path, dest_path, ignore=shutil.ignore_patterns('__pycache__'))
+    for resource in ['instruments', 'static']:
+        shutil.copytree(PROJECT_PATH / 'sscanss' / resource,
+                        resource_path / resource,
+                        ignore=ignore,
+                        copy_function=fast_copy,
+                        dirs_exist_ok=True)
 
     if IS_WINDOWS:
         with open(INSTALLER_PATH / 'windows' / 'version.nsh', 'w') as ver_file:
@@ -230,6 +407,7 @@ def build_sscanss():
     if IS_MAC:
         shutil.rmtree(INSTALLER_PATH / 'bundle' / 'app' / 'sscanss')
 
+    signature_path.write_text(signature)
     print('SScanSS app built with no errors!\n')
 
 
@@ -239,6 +417,7 @@ if __name__ == '__main__':
     parser.add_argument('--test-coverage', action='store_true', help='Run unit test and generate coverage report')
     parser.add_argument('--check-code-format', action='store_true', help='Checks if code formatted correctly')
     parser.add_argument('--format-code', action='store_true', help='Formats code to match style')
+    parser.add_argument('--verify-format', action='store_true', help='Verify the code after formatting with YAPF')
     parser.add_argument('--run-linter', action='store_true', help='Run linter on the code')
     parser.add_argument('--check-all', action='store_true', help='Check code style and tests')
     parser.add_argument('--build-sscanss', action='store_true', help='Build the sscanss executable')
@@ -261,7 +440,7 @@ if __name__ == '__main__':
         args.test_coverage = True
 
     if args.check_code_format or args.format_code:
-        format_code(args.check_code_format)
+        format_code(args.check_code_format, args.verify_format)
 
     if args.run_linter:
         linting()
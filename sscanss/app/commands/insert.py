@@ -766,7 +766,7 @@ class InsertVectors(QtGui.QUndoCommand):
             raise ValueError('Normal cannot be computed on a volume')
 
         points = self.presenter.model.measurement_points.points[index]
-        vertices = sample.vertices[sample.indices]
+        vertices = np.take(sample.vertices, sample.indices, axis=0)
         face_vertices = vertices.reshape(-1, 9)
         faces = closest_triangle_to_point(face_vertices, points)
 
@@ -2,7 +2,7 @@ import numpy as np
 from PyQt6 import QtCore, QtGui, QtWidgets
 from sscanss.config import settings
 from sscanss.core.math import Plane, clamp, map_range, trunc, view_from_plane, VECTOR_EPS, POS_EPS, Line
-from sscanss.core.geometry import mesh_plane_intersection, Mesh, volume_plane_intersection, line_box_intersection
+from sscanss.core.geometry import MeshPlaneSlicer, Mesh, volume_plane_intersection, line_box_intersection
 from sscanss.core.util import (Primitives, DockFlag, StrainComponents, PointType, PlaneOptions, create_tool_button,
                                create_scroll_area, create_icon, FormTitle, CompareValidator, FormGroup, FormControl,
                                FilePicker, Anchor)
@@ -459,6 +459,7 @@ class PickPointDialog(QtWidgets.QWidget):
     def prepareMesh(self):
         """Setup sample mesh and initialize UI. UI is disabled if no mesh is present"""
         self.mesh = None
+        self.slicer = None
         self.scene.disabled = True
         sample = self.parent_model.sample
         if sample is not None:
@@ -1184,10 +1185,11 @@ class PickPointDialog(QtWidgets.QWidget):
             return
 
         if isinstance(self.mesh, Mesh):
-            segments = mesh_plane_intersection(self.mesh, self.plane)
+            if self.slicer is None or self.slicer.vertices is not self.mesh.vertices:
+                self.slicer = MeshPlaneSlicer(self.mesh)
+            segments = self.slicer.intersect(self.plane)
             if len(segments) == 0:
                 return
-            segments = np.array(segments)
 
             cross_section_item = QtWidgets.QGraphicsPathItem()
             cross_section_path = QtGui.QPainterPath()
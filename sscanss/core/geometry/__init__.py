@@ -1,7 +1,9 @@
 from .primitive import create_cuboid, create_cylinder, create_sphere, create_tube, create_plane, create_cone
-from .intersection import (closest_triangle_to_point, mesh_plane_intersection, segment_triangle_intersection,
-                           segment_plane_intersection, path_length_calculation, point_selection,
-                           volume_plane_intersection, volume_ray_intersection, line_box_intersection)
+from .intersection import (closest_triangle_to_point, mesh_plane_intersection, MeshPlaneSlicer,
+                           segment_triangle_intersection, segment_plane_intersection, segments_plane_intersection,
+                           path_length_calculation, point_selection, volume_plane_intersection, volume_ray_intersection,
+                           line_box_intersection, TriangleBVH, point_triangle_distance, triangle_distance_data,
+                           plane_axis)
 from .mesh import Mesh, MeshGroup, compute_face_normals, BoundingBox
 from .colour import Colour
 from .volume import Volume, Curve
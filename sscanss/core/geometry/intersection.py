@@ -4,11 +4,14 @@ Functions for geometry intersection and path length calculation
 import numpy as np
 from scipy import ndimage
 from scipy.interpolate import RegularGridInterpolator
+from ..math.misc import squared_norm
 from ..math.transform import view_from_plane
 from sscanss.core.geometry.primitive import create_cuboid
 from ..math.vector import Vector3, Vector4
 
 eps = 0.000001
+BVH_MIN_POINTS = 8
+BVH_BATCH_SIZE = 2**18
 
 
 def line_box_intersection(line, min_bound, max_bound):
@@ -39,137 +42,393 @@ def line_box_intersection(line, min_bound, max_bound):
     return None
 
 
-def closest_triangle_to_point(faces, points):
-    """Computes the closest face to a given 3D point. Assumes face is triangular.
-    Based on code from http://www.iquilezles.org/www/articles/triangledistance/triangledistance.htm
+def triangle_distance_data(faces):
+    """Computes the edges and normals of triangular faces used by point_triangle_distance. The data is
+    stored face first with the edges of each face stored together, so a contiguous range of faces can be
+    sliced from every array and the three edges of a face are handled in a single operation.
 
-    :param faces: faces: N x 9 array of triangular face vertices
+    :param faces: N x 9 array of triangular face vertices
     :type faces: numpy.ndarray
-    :param points: M x 3 array of points to find the closest faces
+    :return: face vertices, edges, edge normals, inverse squared edge lengths, normals and inverse squared
+             normal lengths
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]
+    """
+    vertices = faces.reshape(-1, 3, 3)
+    edges = np.roll(vertices, -1, axis=1) - vertices
+    normals = np.cross(edges[:, 0], edges[:, 2])
+    edge_normals = np.cross(edges, normals[:, np.newaxis])
+    inv_edge_lengths = 1.0 / squared_norm(edges)
+    inv_normal_lengths = 1.0 / squared_norm(normals)
+
+    return vertices, edges, edge_normals, inv_edge_lengths, normals, inv_normal_lengths
+
+
+def point_triangle_distance(points, vertices, edges, edge_normals, inv_edge_lengths, normals, inv_normal_lengths):
+    """Computes the squared distance from points to triangular faces without looping over either. The
+    point is compared with the face plane when it projects inside the face, otherwise with the closest edge.
+    Based on code from http://www.iquilezles.org/www/articles/triangledistance/triangledistance.htm
+
+    :param points: 3D point or M x 3 array of points
     :type points: numpy.ndarray
-    :return: M x 9 array of faces corresponding to points
+    :param vertices: N x 3 x 3 array of face vertices
+    :type vertices: numpy.ndarray
+    :param edges: N x 3 x 3 array of face edges
+    :type edges: numpy.ndarray
+    :param edge_normals: N x 3 x 3 array of vectors perpendicular to the face edges
+    :type edge_normals: numpy.ndarray
+    :param inv_edge_lengths: N x 3 array of inverse squared edge lengths
+    :type inv_edge_lengths: numpy.ndarray
+    :param normals: N x 3 array of face normals
+    :type normals: numpy.ndarray
+    :param inv_normal_lengths: array of inverse squared normal lengths
+    :type inv_normal_lengths: numpy.ndarray
+    :return: N array or M x N array of squared distances
     :rtype: numpy.ndarray
     """
-    result = []
+    vectors = points[..., np.newaxis, np.newaxis, :] - vertices
+    outside = np.sign(np.einsum('...j,...j->...', edge_normals, vectors)).sum(axis=-1) < 2.0
 
-    v1 = faces[:, 0:3]
-    v2 = faces[:, 3:6]
-    v3 = faces[:, 6:9]
-    v21 = v2 - v1
-    v32 = v3 - v2
-    v13 = v1 - v3
-    nor = np.cross(v21, v13)
-    c13 = np.cross(v13, nor)
-    c32 = np.cross(v32, nor)
-    c21 = np.cross(v21, nor)
-    dot_v21 = 1.0 / np.einsum('ij,ij->i', v21, v21)
-    dot_v32 = 1.0 / np.einsum('ij,ij->i', v32, v32)
-    dot_v13 = 1.0 / np.einsum('ij,ij->i', v13, v13)
-    dot_nor = 1.0 / np.einsum('ij,ij->i', nor, nor)
+    t = np.clip(np.einsum('...j,...j->...', edges, vectors) * inv_edge_lengths, 0.0, 1.0)
+    edge_vectors = edges * t[..., np.newaxis] - vectors
+    edge_dist = np.einsum('...j,...j->...', edge_vectors, edge_vectors).min(axis=-1)
 
-    for point in points:
-        dist = np.zeros(v1.shape[0], v1.dtype)
+    plane_dist = np.einsum('...j,...j->...', normals, vectors[..., 0, :])
+    plane_dist = plane_dist * plane_dist * inv_normal_lengths
 
-        p1 = point - v1
-        p2 = point - v2
-        p3 = point - v3
+    return np.where(outside, edge_dist, plane_dist)
 
-        mask = (np.sign(np.einsum('ij,ij->i', c21, p1)) + np.sign(np.einsum('ij,ij->i', c32, p2)) +
-                np.sign(np.einsum('ij,ij->i', c13, p3)))
 
-        mask = mask < 2.0
+class TriangleBVH:
+    """Creates a bounding volume hierarchy of axis aligned bounding boxes for triangular faces. The
+    hierarchy is built once and used to find the closest face to points without testing every face,
+    leaves are skipped when their bounding box is further from a point than the closest face found.
+    The nodes are split along the longest axis of their bounding box at the median face centroid.
 
-        oo = v21[mask]
-        ooo = p1[mask]
-        temp = oo * np.clip(np.einsum('ij,ij->i', oo, ooo) * dot_v21[mask], 0.0, 1.0)[:, np.newaxis] - ooo
-        temp = np.einsum('ij,ij->i', temp, temp)
+    :param faces: N x 9 array of triangular face vertices
+    :type faces: numpy.ndarray
+    :param leaf_size: maximum number of faces in a leaf node
+    :type leaf_size: int
+    """
+    def __init__(self, faces, leaf_size=64):
+        triangles = faces.reshape(-1, 3, 3)
+        face_min = triangles.min(axis=1)
+        face_max = triangles.max(axis=1)
+        centroids = (face_min + face_max) / 2
+
+        order = np.arange(triangles.shape[0])
+        node_min, node_max, left, right, first, count = [None], [None], [-1], [-1], [0], [0]
+        stack = [(0, 0, order.size)]
+        while stack:
+            node, start, end = stack.pop()
+            index = order[start:end]
+            bounds_min = face_min[index].min(axis=0)
+            bounds_max = face_max[index].max(axis=0)
+            node_min[node], node_max[node] = bounds_min, bounds_max
+            first[node] = start
+            if end - start <= leaf_size:
+                count[node] = end - start
+                continue
+
+            axis = np.argmax(bounds_max - bounds_min)
+            middle = (start + end) // 2
+            order[start:end] = index[np.argpartition(centroids[index, axis], middle - start)]
+            left[node], right[node] = len(node_min), len(node_min) + 1
+            for values, value in ((node_min, None), (node_max, None), (left, -1), (right, -1), (first, 0), (count, 0)):
+                values.extend((value, value))
+            stack.append((right[node], middle, end))
+            stack.append((left[node], start, middle))
+
+        self.node_min = np.array(node_min)
+        self.node_max = np.array(node_max)
+        self.left = np.array(left)
+        self.right = np.array(right)
+        self.first = np.array(first)
+        self.count = np.array(count)
+        self.face_index = order
+        self.faces = faces[order]
+
+        self.face_data = triangle_distance_data(self.faces)
+
+    def closestFaces(self, points, max_sq_dist=np.inf, accept_sq_dist=None):
+        """Finds the index of the closest face to each 3D point. The points are processed together,
+        each round every unfinished point visits its next nearest leaf and all the visited leaves are
+        compared with their points in a single call, so the numpy call overhead is paid per round instead
+        of per point and leaf. A point is finished when its next nearest leaf is further than the closest
+        face found or when the closest face found is within accept_sq_dist. When faces are equidistant
+        the face with the lowest index is returned.
+
+        :param points: M x 3 array of points
+        :type points: numpy.ndarray
+        :param max_sq_dist: maximum squared distance of face from point
+        :type max_sq_dist: float
+        :param accept_sq_dist: squared distance at which a face is accepted without searching further
+        :type accept_sq_dist: Union[float, None]
+        :return: index of the closest face for each point or -1 if no face is within max_sq_dist
+        :rtype: numpy.ndarray
+        """
+        points = np.asarray(points).reshape(-1, 3)
+        leaves = np.flatnonzero(self.count > 0)
+        leaf_min = self.node_min[leaves]
+        leaf_max = self.node_max[leaves]
+        # leaves are padded to the same size by repeating their last face which does not change the result
+        leaf_size = self.count[leaves].max()
+        leaf_faces = self.first[leaves, np.newaxis] + np.minimum(np.arange(leaf_size),
+                                                                 self.count[leaves, np.newaxis] - 1)
+
+        best_dist = np.full(points.shape[0], max_sq_dist, dtype=float)
+        best_index = np.full(points.shape[0], -1)
+        # points are processed in chunks to limit the size of the intermediate arrays
+        chunk_size = max(1, BVH_BATCH_SIZE // (leaves.size + leaf_size))
+        for chunk in range(0, points.shape[0], chunk_size):
+            rows = np.arange(chunk, min(chunk + chunk_size, points.shape[0]))
+            chunk_points = points[rows, np.newaxis, :]
+            box_dist = squared_norm(np.maximum(np.maximum(leaf_min - chunk_points, chunk_points - leaf_max), 0.0))
+            visit_order = np.argsort(box_dist, axis=1)
+            active = np.arange(rows.size)
+            for k in range(leaves.size):
+                next_leaf = visit_order[active, k]
+                keep = box_dist[active, next_leaf] <= best_dist[rows[active]]
+                if accept_sq_dist is not None:
+                    keep &= (best_index[rows[active]] < 0) | (best_dist[rows[active]] > accept_sq_dist)
+                active, next_leaf = active[keep], next_leaf[keep]
+                if active.size == 0:
+                    break
+
+                selected = rows[active]
+                faces = leaf_faces[next_leaf]
+                dist = point_triangle_distance(points[selected], *(data[faces] for data in self.face_data))
+                min_dist = dist.min(axis=1)
+                index = np.where(dist == min_dist[:, np.newaxis], self.face_index[faces], self.face_index.size)
+                index = index.min(axis=1)
+                current_dist, current_index = best_dist[selected], best_index[selected]
+                update = (min_dist <= current_dist) & ((current_index < 0) | (min_dist < current_dist) |
+                                                       (index < current_index))
+                best_dist[selected[update]] = min_dist[update]
+                best_index[selected[update]] = index[update]
+
+        return best_index
+
+
+def closest_triangle_to_point(faces, points, max_sq_dist=np.inf, accept_sq_dist=None):
+    """Computes the closest face to a given 3D point. Assumes face is triangular.
+    Based on code from http://www.iquilezles.org/www/articles/triangledistance/triangledistance.htm
 
-        oo = v32[mask]
-        ooo = p2[mask]
-        temp_2 = oo * np.clip(np.einsum('ij,ij->i', oo, ooo) * dot_v32[mask], 0.0, 1.0)[:, np.newaxis] - ooo
-        temp_2 = np.einsum('ij,ij->i', temp_2, temp_2)
+    :param faces: faces: N x 9 array of triangular face vertices
+    :type faces: numpy.ndarray
+    :param points: M x 3 array of points to find the closest faces
+    :type points: numpy.ndarray
+    :param max_sq_dist: maximum squared distance of face from point, faces further away are not searched
+    :type max_sq_dist: float
+    :param accept_sq_dist: squared distance at which a face is accepted without searching further, the
+                           returned face may then not be the closest
+    :type accept_sq_dist: Union[float, None]
+    :return: M x 9 array of faces corresponding to points, rows for points without a face within
+             max_sq_dist are NaN
+    :rtype: numpy.ndarray
+    """
+    points = np.asarray(points)
+    if points.shape[0] > BVH_MIN_POINTS:
+        bvh = TriangleBVH(faces)
+        index = bvh.closestFaces(points, max_sq_dist, accept_sq_dist)
+    else:
+        # Building the hierarchy costs more than testing every face when there are only a few points. The faces
+        # are tested in chunks so the size of the intermediate arrays does not grow with the number of faces
+        rows = np.arange(points.shape[0])
+        best_dist = np.full(points.shape[0], max_sq_dist, dtype=float)
+        index = np.full(points.shape[0], -1)
+        chunk_size = max(1, BVH_BATCH_SIZE // max(points.shape[0], 1))
+        for start in range(0, faces.shape[0], chunk_size):
+            dist = point_triangle_distance(points, *triangle_distance_data(faces[start:start + chunk_size]))
+            chunk_index = dist.argmin(axis=-1)
+            chunk_dist = dist[rows, chunk_index]
+            update = (chunk_dist < best_dist) | ((index < 0) & (chunk_dist <= best_dist))
+            best_dist[update] = chunk_dist[update]
+            index[update] = chunk_index[update] + start
+            if accept_sq_dist is not None and np.all((index >= 0) & (best_dist <= accept_sq_dist)):
+                break
 
-        oo = v13[mask]
-        ooo = p3[mask]
-        temp_3 = oo * np.clip(np.einsum('ij,ij->i', oo, ooo) * dot_v13[mask], 0.0, 1.0)[:, np.newaxis] - ooo
-        temp_3 = np.einsum('ij,ij->i', temp_3, temp_3)
+    result = np.full((index.size, faces.shape[1]), np.nan, dtype=np.promote_types(faces.dtype, np.float32))
+    result[index >= 0] = faces[index[index >= 0]]
+    return result
 
-        inv_mask = ~mask
-        temp_4 = np.einsum('ij,ij->i', nor[inv_mask], p1[inv_mask])
-        dist[inv_mask] = temp_4 * temp_4 * dot_nor[inv_mask]
 
-        dist[mask] = np.minimum(temp, np.minimum(temp_2, temp_3))
+def plane_axis(normal):
+    """Gets the index of the coordinate axis a plane normal is aligned with
 
-        closest_face = faces[dist.argmin()]
-        result.append(closest_face)
+    :param normal: plane normal
+    :type normal: Union[numpy.ndarray, Vector3]
+    :return: index of the axis or -1 if the normal is not axis-aligned
+    :rtype: int
+    """
+    axes = np.flatnonzero(normal)
+    return int(axes[0]) if axes.size == 1 else -1
 
-    return np.array(result)
+
+class MeshPlaneSlicer:
+    """Computes the intersection between a triangular mesh and planes. The projection of the
+    vertices onto each plane normal is cached so stacks of parallel planes only compute it once,
+    and axis-aligned normals read the vertex column directly. The slicer keeps a reference to the
+    mesh arrays so a new slicer should be created if the mesh is modified.
+
+    :param mesh: a triangular mesh
+    :type mesh: Mesh
+    """
+    cache_size = 16
+
+    def __init__(self, mesh):
+        self.vertices = mesh.vertices
+        self.faces = mesh.face_indices
+        # contiguous copies of each face vertex index are faster to gather with than the columns of faces
+        self._face_columns = np.ascontiguousarray(self.faces.transpose())
+        self._cache = {}
+
+    def _projection(self, normal):
+        """Gets the dot product of the vertices with the given normal
+
+        :param normal: plane normal
+        :type normal: Vector3
+        :return: projection of each vertex onto the normal
+        :rtype: numpy.ndarray
+        """
+        key = tuple(normal)
+        projection = self._cache.get(key)
+        if projection is not None:
+            return projection
+
+        axis = plane_axis(normal)
+        if axis >= 0:
+            projection = self.vertices[:, axis].astype(np.float64) * normal[axis]
+        else:
+            projection = np.dot(self.vertices, np.asarray(normal, np.float64))
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[key] = projection
+        return projection
+
+    def intersect(self, plane):
+        """Gets the intersection between the mesh and a plane. The algorithm returns
+        a set of lines is points pairs where each even indexed point is the start of a line
+        and the next point is the end. An empty array implies no intersection.
+        Based on code from *Real-Time Collision Detection (1st Edition) By Christer Ericson*
+
+        :param plane: plane normal and point
+        :type plane: Plane
+        :return: array of points pairs
+        :rtype: numpy.ndarray
+        """
+        # The signed distance of each vertex from the plane is computed once then the faces are classified
+        # by the number of vertices on the plane. Faces with all vertices on the same side of the plane or flush
+        # with the plane do not intersect it. The intersection points for every face are computed at once.
+        vertices = self.vertices
+        faces = self.faces
+        axis = plane_axis(plane.normal)
+        dist = self._projection(plane.normal) - np.dot(plane.point, plane.normal)
+        # the side of each vertex is encoded in two bits (1 is above, 2 is below and 0 is on the plane) so
+        # faces are classified by combining the bits of their vertices instead of comparing every face distance
+        side = (dist > 0).view(np.uint8) | ((dist < 0).view(np.uint8) << 1)
+        side_0, side_1, side_2 = (side[column] for column in self._face_columns)
+        any_side = side_0 | side_1 | side_2
+        common_side = side_0 & side_1 & side_2
+        candidates = np.flatnonzero((any_side == 3) | ((any_side != 0) & (common_side == 0)))
+        if candidates.size == 0:
+            return np.empty((0, 3))
+
+        faces = faces[candidates]
+        all_dist = dist[faces]
+        on_plane = all_dist == 0
+        on_plane_count = on_plane.sum(axis=1)
+
+        start = np.empty((candidates.size, 3))
+        end = np.empty((candidates.size, 3))
+        valid = np.zeros(candidates.size, bool)
+
+        def edge_intersection(rows, i, j):
+            points_a = np.take(vertices, faces[rows, i], axis=0)
+            points_b = np.take(vertices, faces[rows, j], axis=0)
+            # the distance along an axis-aligned normal is exact so the projection along the edge is not needed
+            dist_b = all_dist[rows, j] if axis >= 0 else None
+            return segments_plane_intersection(points_a, points_b, plane, all_dist[rows, i], dist_b)
+
+        # edge lies on the plane
+        rows = np.nonzero(on_plane_count == 2)[0]
+        columns = np.nonzero(on_plane[rows])[1].reshape(-1, 2)
+        start[rows] = np.take(vertices, faces[rows, columns[:, 0]], axis=0)
+        end[rows] = np.take(vertices, faces[rows, columns[:, 1]], axis=0)
+        valid[rows] = True
+
+        # point lies on plane so check intersection for a single line
+        rows = np.nonzero(on_plane_count == 1)[0]
+        columns = np.argmax(on_plane[rows], axis=1)
+        opposite_edges = np.array([(1, 2), (0, 2), (0, 1)])[columns]
+        start[rows] = np.take(vertices, faces[rows, columns], axis=0)
+        end[rows], valid[rows] = edge_intersection(rows, opposite_edges[:, 0], opposite_edges[:, 1])
+
+        # the first two edges that intersect the plane form the line
+        rows = np.nonzero(on_plane_count == 0)[0]
+        points, intersects = zip(*(edge_intersection(rows, i, j) for i, j in ((0, 1), (1, 2), (0, 2))))
+        points = np.stack(points, axis=1)
+        intersects = np.column_stack(intersects)
+        first = np.argmax(intersects, axis=1)
+        intersects[np.arange(rows.size), first] = False
+        second = np.argmax(intersects, axis=1)
+        start[rows] = points[np.arange(rows.size), first]
+        end[rows] = points[np.arange(rows.size), second]
+        valid[rows] = intersects.any(axis=1)
+
+        segments = np.column_stack((start[valid], end[valid])).reshape(-1, 3)
+        if axis >= 0:
+            # the points lie on the plane so the axis coordinate is snapped to remove rounding errors
+            segments[:, axis] = plane.point[axis]
+
+        return segments
 
 
 def mesh_plane_intersection(mesh, plane):
     """Gets the intersection between a triangular mesh and a plane. The algorithm returns
     a set of lines is points pairs where each even indexed point is the start of a line
-    and the next point is the end. An empty list implies no intersection.
-    Based on code from *Real-Time Collision Detection (1st Edition) By Christer Ericson*
+    and the next point is the end. An empty array implies no intersection.
 
     :param mesh: a triangular mesh
     :type mesh: Mesh
     :param plane: plane normal and point
     :type plane: Plane
     :return: array of points pairs
-    :rtype: List[numpy.ndarray]
+    :rtype: numpy.ndarray
     """
-    # The algorithm checks if all vertices on each mesh face are on the same side of the plane
-    # if this is true, the face does not intersect the plane. Once the faces that intersect
-    # the plane are determined, the segments that form the face are tested for intersection with the plane.
-    segments = []
-    all_vertices = mesh.vertices[mesh.indices]
-    all_dist = np.dot(all_vertices - plane.point, plane.normal)
-    offsets = range(0, all_vertices.shape[0], 3)
-    gg = np.logical_and.reduceat(all_dist > 0, offsets)
-    ll = np.logical_and.reduceat(all_dist < 0, offsets)
-    indices = np.where(~ll & ~gg)[0] * 3
-    if indices.size == 0:
-        return segments
-
-    for index in indices:
-        dist = all_dist[index:index + 3]
-        vertices = all_vertices[index:index + 3, :]
-
-        points = []
-        non_zeros = np.nonzero(dist)[0]
-        if non_zeros.size == 0:
-            # all vertices on the plane we currently don't
-            # care about this condition
-            continue
-        elif non_zeros.size == 1:
-            # edge lies on the plane
-            tmp = np.delete((0, 1, 2), non_zeros[0])
-            a = vertices[tmp[0], :]
-            b = vertices[tmp[1], :]
-            segments.extend([a, b])
-            continue
-        elif non_zeros.size == 2:
-            # point lies on plane so check intersection for a single line
-            tmp = np.delete((0, 1, 2), non_zeros)
-            points.append(vertices[tmp[0], :])
-            face_indices = [(non_zeros[0], non_zeros[1])]
-        else:
-            face_indices = [(0, 1), (1, 2), (0, 2)]
-
-        for i, j in face_indices:
-            a = vertices[i, :]
-            b = vertices[j, :]
+    return MeshPlaneSlicer(mesh).intersect(plane)
 
-            point = segment_plane_intersection(a, b, plane)
-            if point is not None:
-                points.append(point)
 
-            if len(points) == 2:
-                segments.extend([points[0], points[1]])
-                break
+def segments_plane_intersection(points_a, points_b, plane, dist_a=None, dist_b=None):
+    """Gets the intersection between line segments and a plane. Segments that lie on the plane or
+    do not reach the plane are marked as not intersecting
 
-    return segments
+    :param points_a: N x 3 array of starting points of the segments
+    :type points_a: numpy.ndarray
+    :param points_b: N x 3 array of ending points of the segments
+    :type points_b: numpy.ndarray
+    :param plane: the plane
+    :type plane: Plane
+    :param dist_a: signed distance of starting points from the plane
+    :type dist_a: Optional[numpy.ndarray]
+    :param dist_b: signed distance of ending points from the plane, used instead of projecting the segments
+                   onto the plane normal when dist_a is also given
+    :type dist_b: Optional[numpy.ndarray]
+    :return: points of intersection and flags indicating which segments intersect the plane
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+    ab = points_b - points_a
+    if dist_a is None or dist_b is None:
+        d = np.dot(ab, plane.normal)
+    else:
+        d = dist_b - dist_a
+    if dist_a is None:
+        dist_a = np.dot(points_a - plane.point, plane.normal)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = -dist_a / d
+        # ignore case where line lies on plane
+        intersects = ((d <= -eps) | (d >= eps)) & (t >= 0.0) & (t <= 1.0)
+        return points_a + t[..., np.newaxis] * ab, intersects
 
 
 def segment_plane_intersection(point_a, point_b, plane):
@@ -184,18 +443,9 @@ def segment_plane_intersection(point_a, point_b, plane):
     :return: point of intersection or None if no intersection
     :rtype: Union[numpy.ndarray, None]
     """
-    ab = point_b - point_a
-    n = -np.dot(plane.normal, point_a - plane.point)
-    d = np.dot(plane.normal, ab)
-    if -eps < d < eps:
-        # ignore case where line lies on plane
-        return None
-    t = n / d
-    if 0.0 <= t <= 1.0:
-        q = point_a + t * ab
-        return q
+    point, intersects = segments_plane_intersection(np.asarray(point_a), np.asarray(point_b), plane)
 
-    return None
+    return point if intersects else None
 
 
 def segment_triangle_intersection(origin, direction, length, faces, tol=1e-5):
@@ -292,7 +542,7 @@ def path_length_calculation(mesh, gauge_volume, beam_axis, diff_axis):
 
     length = mesh.bounding_box.radius + 100  # mesh radius + fudge value
     num_of_detectors = len(diff_axis)
-    vertices = mesh.vertices[mesh.indices]
+    vertices = np.take(mesh.vertices, mesh.indices, axis=0)
     v = vertices.reshape(-1, 9)
 
     # incoming beam from beam source to gauge volume
@@ -434,7 +684,7 @@ def volume_ray_intersection(start, end, volume):
     line_segment_direction = end - start
     line_segment_length = line_segment_direction.length
     line_segment_direction /= line_segment_length
-    faces = bounding_box_mesh.vertices[bounding_box_mesh.indices].reshape(-1, 9)
+    faces = np.take(bounding_box_mesh.vertices, bounding_box_mesh.indices, axis=0).reshape(-1, 9)
 
     intersection_distances = segment_triangle_intersection(start, line_segment_direction, line_segment_length, faces)
 
@@ -4,6 +4,7 @@ Classes for Mesh and Bounding-Box objects
 import numpy as np
 from .colour import Colour
 from ..math.constants import VECTOR_EPS
+from ..math.misc import squared_norm
 from ..math.matrix import Matrix44
 from ..math.vector import Vector3
 
@@ -27,7 +28,7 @@ def compute_face_normals(vertices, remove_degenerate=False):
     edge_2 = face_vertices[:, 3:6] - face_vertices[:, 6:9]
 
     normals = np.cross(edge_1, edge_2)
-    row_sums = np.linalg.norm(normals, axis=1)
+    row_sums = np.sqrt(squared_norm(normals))
 
     if remove_degenerate:
         good_index = row_sums >= VECTOR_EPS
@@ -41,6 +42,38 @@ def compute_face_normals(vertices, remove_degenerate=False):
     return np.repeat(normals, 3, axis=0) if reshape else normals
 
 
+def append_rows(array, values, buffer=None):
+    """Appends values to the end of an array. The returned array is a view of a buffer with spare capacity
+    which is reused by the next append if the returned view and buffer are given back unchanged, the buffer
+    capacity is doubled when it is full so appending many times copies each row a constant number of times
+    on average.
+
+    :param array: array to append to
+    :type array: numpy.ndarray
+    :param values: values to append
+    :type values: numpy.ndarray
+    :param buffer: buffer and number of rows used from a previous append
+    :type buffer: Optional[Tuple[numpy.ndarray, int]]
+    :return: appended array and the buffer with the number of rows used
+    :rtype: Tuple[numpy.ndarray, Tuple[numpy.ndarray, int]]
+    """
+    count = array.shape[0]
+    size = count + values.shape[0]
+    dtype = np.result_type(array, values)
+    data, used = (None, 0) if buffer is None else buffer
+
+    # the buffer is only reused if array is still the view of its first rows, otherwise the spare rows
+    # could overlap an array split from it
+    reusable = (data is not None and array.base is data and used == count and data.dtype == dtype
+                and array.ctypes.data == data.ctypes.data)
+    if not reusable or size > data.shape[0]:
+        data = np.empty((max(2 * count, size), *array.shape[1:]), dtype)
+        data[:count] = array
+
+    data[count:size] = values
+    return data[:size], (data, size)
+
+
 class Mesh:
     """Creates a Mesh object. Calculates the bounding box of the Mesh and calculates normals
      if not provided. Removes unused vertices, degenerate faces and duplicate vertices when clean is True.
@@ -62,6 +95,7 @@ class Mesh:
         if not np.isfinite(vertices).all():
             raise ValueError('Non-finite value present in mesh vertices')
 
+        self._buffers = {}
         self.vertices = vertices
         self.indices = indices
 
@@ -76,7 +110,8 @@ class Mesh:
 
     @property
     def vertices(self):
-        """Gets and sets the vertices of the mesh and updates the bounding box
+        """Gets and sets the vertices of the mesh and updates the bounding box. The vertices
+        are stored as 32-bit floats
 
         :return: array of vertices
         :rtype: numpy.ndarray
@@ -85,9 +120,47 @@ class Mesh:
 
     @vertices.setter
     def vertices(self, value):
-        self._vertices = value
+        self._vertices = np.asarray(value, dtype=np.float32)
         self.bounding_box = BoundingBox.fromPoints(self.vertices)
 
+    @property
+    def indices(self):
+        """Gets and sets the indices of the mesh. The indices are stored as 32-bit unsigned integers
+        with a persistent N x 3 view of the faces
+
+        :return: array of indices
+        :rtype: numpy.ndarray
+        """
+        return self._indices
+
+    @indices.setter
+    def indices(self, value):
+        self._indices = np.asarray(value, dtype=np.uint32)
+        self._face_indices = self._indices.reshape(-1, 3)
+
+    @property
+    def face_indices(self):
+        """Gets the indices of the mesh as an N x 3 array with a row for each triangular face. This is a
+        view of the indices so it is not copied
+
+        :return: array of face indices
+        :rtype: numpy.ndarray
+        """
+        return self._face_indices
+
+    @property
+    def normals(self):
+        """Gets and sets the normals of the mesh. The normals are stored as 32-bit floats
+
+        :return: array of normals
+        :rtype: numpy.ndarray
+        """
+        return self._normals
+
+    @normals.setter
+    def normals(self, value):
+        self._normals = np.asarray(value, dtype=np.float32)
+
     def append(self, mesh):
         """Appends a given mesh to this mesh. Indices are offset to ensure the correct
         vertices and normals are used
@@ -96,9 +169,13 @@ class Mesh:
         :type mesh: Mesh
         """
         count = self.vertices.shape[0]
-        self.vertices = np.vstack((self.vertices, mesh.vertices))
-        self.indices = np.concatenate((self.indices, mesh.indices + count))
-        self.normals = np.vstack((self.normals, mesh.normals))
+        # the merged bounding box is exact so the combined vertices are not searched again
+        bounding_box = BoundingBox.merge([self.bounding_box, mesh.bounding_box])
+        buffers = self._buffers
+        self._vertices, buffers['vertices'] = append_rows(self.vertices, mesh.vertices, buffers.get('vertices'))
+        self.bounding_box = bounding_box
+        self.indices, buffers['indices'] = append_rows(self.indices, mesh.indices + count, buffers.get('indices'))
+        self._normals, buffers['normals'] = append_rows(self.normals, mesh.normals, buffers.get('normals'))
 
     def remove(self, index):
         """Splits this mesh into two parts using the given index. This operation can be used as an inverse
@@ -128,7 +205,7 @@ class Mesh:
         :param matrix: 3 x 3 rotation matrix
         :type matrix: Union[numpy.ndarray, Matrix33]
         """
-        _matrix = matrix[0:3, 0:3].transpose()
+        _matrix = np.asarray(matrix[0:3, 0:3], np.float32).transpose()
         self.vertices = self.vertices @ _matrix
         self.normals = self.normals @ _matrix
 
@@ -138,7 +215,10 @@ class Mesh:
         :param offset: 3 x 1 array of offsets for X, Y and Z axis
         :type offset: Union[numpy.ndarray, Vector3]
         """
-        self.vertices = self.vertices + offset
+        self._vertices = (self.vertices + offset).astype(np.float32)
+        # rounding is monotonic so translating the bounds gives the same box as the translated vertices
+        self.bounding_box = BoundingBox(np.asarray(self.bounding_box.max + offset, np.float32),
+                                        np.asarray(self.bounding_box.min + offset, np.float32))
 
     def transform(self, matrix):
         """Performs in-place transformation of mesh
@@ -146,10 +226,7 @@ class Mesh:
         :param matrix: 4 x 4 transformation matrix
         :type matrix: Union[numpy.ndarray, Matrix44]
         """
-        mesh = self.transformed(matrix)
-        self._vertices = mesh.vertices
-        self.normals = mesh.normals
-        self.bounding_box = mesh.bounding_box
+        self.vertices, self.normals = self._transformArrays(matrix)
 
     def transformed(self, matrix):
         """Performs a transformation of mesh
@@ -159,26 +236,40 @@ class Mesh:
         :return: transformed mesh
         :rtype: Mesh
         """
-        _matrix = matrix[0:3, 0:3].transpose()
-        offset = matrix[0:3, 3].transpose()
-
-        vertices = self.vertices @ _matrix + offset
-        normals = self.normals @ _matrix
+        vertices, normals = self._transformArrays(matrix)
 
         return Mesh(vertices, np.copy(self.indices), normals, Colour(*self.colour))
 
+    def _transformArrays(self, matrix):
+        """Transforms the vertices and normals of the mesh with a single matrix multiplication each
+        in 32-bit float precision. The 4 x 4 matrix is applied as a 3 x 3 rotation and an offset which
+        is added in-place to the product so no homogeneous coordinates or extra temporary array is needed
+
+        :param matrix: 4 x 4 transformation matrix
+        :type matrix: Union[numpy.ndarray, Matrix44]
+        :return: transformed vertices and normals
+        :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+        """
+        _matrix = np.asarray(matrix[0:3, 0:3], np.float32).transpose()
+        offset = np.asarray(matrix[0:3, 3], np.float32)
+
+        vertices = self.vertices @ _matrix
+        vertices += offset
+
+        return vertices, self.normals @ _matrix
+
     def computeNormals(self):
         """Computes normals for the mesh and removes unused vertices, degenerate
         faces and duplicate vertices
         """
-        vertices = self.vertices[self.indices]
+        vertices = np.take(self.vertices, self.indices, axis=0)
 
         # Also removes unused vertices because of indexed vertices
         vn = compute_face_normals(vertices, remove_degenerate=True)
         vn, inverse = np.unique(np.hstack(vn), return_inverse=True, axis=0)
 
-        self._vertices = vn[:, 0:3]  # bounds should not be changed by cleaning
-        self.indices = inverse.astype(np.uint32)
+        self._vertices = vn[:, 0:3].astype(np.float32)  # bounds should not be changed by cleaning
+        self.indices = inverse
         self.normals = vn[:, 3:]
 
     def copy(self):
@@ -187,11 +278,16 @@ class Mesh:
         :return: deep copy of the mesh
         :rtype: Mesh
         """
-        vertices = np.copy(self.vertices)
-        indices = np.copy(self.indices)
-        normals = np.copy(self.normals)
+        # the arrays are already validated so the constructor checks and bounding box search are skipped
+        mesh = Mesh.__new__(Mesh)
+        mesh._buffers = {}
+        mesh._vertices = np.copy(self.vertices)
+        mesh.indices = np.copy(self.indices)
+        mesh._normals = np.copy(self.normals)
+        mesh.bounding_box = BoundingBox(self.bounding_box.max, self.bounding_box.min)
+        mesh.colour = Colour(*self.colour)
 
-        return Mesh(vertices, indices, normals, Colour(*self.colour))
+        return mesh
 
 
 class MeshGroup:
@@ -237,7 +333,20 @@ class BoundingBox:
         self.max = Vector3(max_position)
         self.min = Vector3(min_position)
         self.center = (self.max + self.min) / 2
-        self.radius = np.linalg.norm(self.max - self.min) / 2
+        self.half_extent = (self.max - self.min) / 2
+        self._radius = None
+
+    @property
+    def radius(self):
+        """Gets the radius of the sphere enclosing the box. The radius is computed from the half extent
+        when first requested
+
+        :return: radius of box
+        :rtype: float
+        """
+        if self._radius is None:
+            self._radius = self.half_extent.length
+        return self._radius
 
     @classmethod
     def fromPoints(cls, points):
@@ -248,8 +357,19 @@ class BoundingBox:
         :return: bounding box
         :rtype: BoundingBox
         """
-        max_pos = np.max(points, axis=0)
-        min_pos = np.min(points, axis=0)
+        points = np.asarray(points)
+        block_rows = 32
+        size = points.shape[0] - points.shape[0] % block_rows
+        if size > 0:
+            # reducing along the first axis of a narrow array is slow because each row is reduced separately,
+            # so blocks of rows are reduced in a wide array first and the partial results are combined with
+            # the remaining rows
+            blocks = points[:size].reshape(-1, block_rows * points.shape[1])
+            max_pos = np.vstack((blocks.max(axis=0).reshape(block_rows, -1), points[size:])).max(axis=0)
+            min_pos = np.vstack((blocks.min(axis=0).reshape(block_rows, -1), points[size:])).min(axis=0)
+        else:
+            max_pos = np.max(points, axis=0)
+            min_pos = np.min(points, axis=0)
         return cls(max_pos, min_pos)
 
     @classmethod
@@ -264,13 +384,8 @@ class BoundingBox:
         if not bounding_boxes:
             raise ValueError('bounding_boxes cannot be empty')
 
-        max_pos = min_pos = None
-        for box in bounding_boxes:
-            if max_pos is None:
-                max_pos, min_pos = box.bounds
-            else:
-                max_pos = np.maximum(box.max, max_pos)
-                min_pos = np.minimum(box.min, min_pos)
+        max_pos = np.max([box.max for box in bounding_boxes], axis=0)
+        min_pos = np.min([box.min for box in bounding_boxes], axis=0)
 
         return cls(max_pos, min_pos)
 
@@ -301,21 +416,8 @@ class BoundingBox:
         :param matrix: transformation matrix
         :type matrix: Union[numpy.ndarray, Matrix44]
         """
-        bound_min = [matrix[0, 3], matrix[1, 3], matrix[2, 3]]
-        bound_max = [matrix[0, 3], matrix[1, 3], matrix[2, 3]]
-
-        for i in range(3):
-            for j in range(3):
-
-                a = matrix[i, j] * self.min[j]
-                b = matrix[i, j] * self.max[j]
-
-                if a < b:
-                    bound_min[i] += a
-                    bound_max[i] += b
-
-                else:
-                    bound_min[i] += b
-                    bound_max[i] += a
+        rotation = np.asarray(matrix[0:3, 0:3])
+        center = rotation @ np.asarray(self.center) + np.asarray(matrix[0:3, 3])
+        half_extent = np.abs(rotation) @ np.asarray(self.half_extent)
 
-        return BoundingBox(bound_max, bound_min)
+        return BoundingBox(center + half_extent, center - half_extent)
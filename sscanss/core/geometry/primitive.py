@@ -3,6 +3,7 @@ Functions for creating geometry primitives
 """
 import numpy as np
 from .mesh import Mesh
+from ..math.misc import squared_norm
 from ..math.transform import rotation_btw_vectors
 
 
@@ -216,8 +217,7 @@ def create_tube(inner_radius=0.5, outer_radius=1.0, height=1.0, slices=64, stack
     n_2 = inner_cylinder.normals
     i_1 = outer_cylinder.indices
     # fix face windings for inner cylinder
-    temp = inner_cylinder.indices.reshape(-1, 3)
-    i_2 = temp[:, ::-1].flatten()
+    i_2 = inner_cylinder.face_indices[:, ::-1].flatten()
 
     vertex_count = slices * (stacks + 1)
 
@@ -282,7 +282,7 @@ def create_sphere(radius=1.0, slices=64, stacks=64):
     vertices = np.column_stack((x, y, z))
     # normals are the same as vertices just normalized
     normals = np.copy(vertices)
-    row_sums = np.linalg.norm(normals, axis=1)
+    row_sums = np.sqrt(squared_norm(normals))
     normals = normals / row_sums[:, np.newaxis]
 
     # get index for the mesh
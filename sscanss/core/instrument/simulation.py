@@ -109,7 +109,7 @@ def create_collision_node(instrument):
     start = 0
     for index, end in enumerate(instrument.offsets):
         node = Node()
-        node.vertices = vertices[indices[start:end]]
+        node.vertices = np.take(vertices, indices[start:end], axis=0)
         node.indices = np.arange(0, len(node.vertices))
         node.transform = transforms[index]
         nodes.append(node)
@@ -570,7 +570,7 @@ class Simulation(BaseSimulation):
         self.args['vectors'] = SharedArray.fromNumpyArray(self.args['vectors'])
 
         temp = sample.transformed(alignment) if isinstance(sample, Mesh) else sample.asMesh().transformed(alignment)
-        self.args['sample'] = SharedArray.fromNumpyArray(temp.vertices[temp.indices])
+        self.args['sample'] = SharedArray.fromNumpyArray(np.take(temp.vertices, temp.indices, axis=0))
 
     @staticmethod
     def execute(args):
@@ -712,7 +712,7 @@ class ForwardSimulation(BaseSimulation):
 
         if alignment is not None and sample is not None:
             temp = sample.transformed(alignment) if isinstance(sample, Mesh) else sample.asMesh().transformed(alignment)
-            self.args['sample'] = SharedArray.fromNumpyArray(temp.vertices[temp.indices])
+            self.args['sample'] = SharedArray.fromNumpyArray(np.take(temp.vertices, temp.indices, axis=0))
 
     @staticmethod
     def execute(args):
@@ -196,9 +196,9 @@ def write_binary_stl(filename, mesh):
     face_count = mesh.indices.size // 3
     data = np.recarray(face_count, dtype=record_dtype)
 
-    data.normals = mesh.normals[mesh.indices, :][::3]
+    data.normals = np.take(mesh.normals, mesh.indices[::3], axis=0)
     data.attr = np.zeros((face_count, 1), dtype=np.uint32)
-    data.vertices = mesh.vertices[mesh.indices, :].reshape((-1, 3, 3))
+    data.vertices = np.take(mesh.vertices, mesh.face_indices, axis=0)
 
     with open(filename, 'wb') as stl_file:
         stl_file.seek(80)
@@ -1,4 +1,4 @@
-from .misc import clamp, map_range, trunc, is_close
+from .misc import clamp, map_range, trunc, is_close, squared_norm
 from .vector import Vector, Vector2, Vector3, Vector4
 from .structure import Plane, fit_line_3d, fit_circle_3d, fit_circle_2d, Line
 from .matrix import Matrix, Matrix33, Matrix44
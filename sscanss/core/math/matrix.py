@@ -220,6 +220,8 @@ class Matrix:
         return self.__mul__(other)
 
     def __imatmul__(self, other):
+        if not self._data.flags.writeable:
+            raise ValueError('cannot modify a read-only matrix')
         temp = self.__matmul__(other)
         self._data = temp._data
         return self
@@ -70,3 +70,16 @@ def is_close(a, b, tol=VECTOR_EPS):
     if np.all(np.abs(np.subtract(a, b)) < tol):
         return True
     return False
+
+
+def squared_norm(vectors):
+    """Computes the squared length of 3D vectors by summing the squared components directly, this
+    avoids the temporary squared array and the square root of numpy.linalg.norm
+
+    :param vectors: 3D vector or array of 3D vectors in the last axis
+    :type vectors: numpy.ndarray
+    :return: squared length of the vectors
+    :rtype: Union[float, numpy.ndarray]
+    """
+    x, y, z = vectors[..., 0], vectors[..., 1], vectors[..., 2]
+    return x * x + y * y + z * z
@@ -3,6 +3,7 @@ Classes representing geometric structures
 """
 import numpy as np
 from .constants import VECTOR_EPS
+from .misc import squared_norm
 
 
 class Line:
@@ -224,7 +225,7 @@ def fit_circle_3d(points):
     center = matrix @ [xc, yc, zc]
 
     axis = center - points
-    axis /= np.linalg.norm(axis, axis=1)[:, None]
+    axis /= np.sqrt(squared_norm(axis))[:, None]
     est_center = points + (axis * radius)
     residuals = center - est_center
 
@@ -1,5 +1,6 @@
+from functools import lru_cache
 import numpy as np
-from .node import Node, BatchRenderNode, VolumeNode
+from .node import Node, BatchRenderNode, VolumeNode, AXIS_LINE_INDICES
 from ..geometry.colour import Colour
 from ..geometry.mesh import Mesh
 from ..geometry.primitive import create_sphere, create_plane, create_cuboid
@@ -10,6 +11,37 @@ from ..util import Attributes
 from ...config import settings
 
 
+@lru_cache(maxsize=32)
+def fiducial_sphere(size):
+    """Creates the sphere mesh used to draw fiducial points. The mesh is cached per radius because it is
+    shared by all fiducial points and rebuilt on every scene update, its arrays are made read-only so the
+    cached mesh cannot be modified in place.
+
+    :param size: radius of sphere
+    :type size: float
+    :return: sphere mesh
+    :rtype: Mesh
+    """
+    mesh = create_sphere(size, 32, 32)
+    for array in (mesh.vertices, mesh.indices, mesh.normals):
+        array.setflags(write=False)
+
+    return mesh
+
+
+def translation_matrices(points):
+    """Creates translation matrices for an array of points
+
+    :param points: N x 3 array of points
+    :type points: numpy.ndarray
+    :return: list of translation matrices
+    :rtype: List[Matrix44]
+    """
+    transforms = np.tile(np.identity(4), (len(points), 1, 1))
+    transforms[:, 0:3, 3] = points
+    return [Matrix44(transform) for transform in transforms]
+
+
 class Entity:
     """Base class for rendered entities"""
     def __init__(self):
@@ -38,13 +70,13 @@ class SampleEntity(Entity):
         :return: node containing sample
         :rtype: Union[Node, VolumeNode]
         """
-        sample_node = Node()
-
         if isinstance(self._sample, Mesh):
             sample_node = Node(self._sample)
             sample_node.colour = Colour(*settings.value(settings.Key.Sample_Colour))
         elif isinstance(self._sample, Volume):
             sample_node = VolumeNode(self._sample)
+        else:
+            sample_node = Node()
 
         sample_node.render_mode = render_mode
         sample_node.buildVertexBuffer()
@@ -68,12 +100,11 @@ class FiducialEntity(Entity):
 
         enabled_colour = Colour(*settings.value(settings.Key.Fiducial_Colour))
         disabled_colour = Colour(*settings.value(settings.Key.Fiducial_Disabled_Colour))
-        for point, enabled in fiducials:
-            colour = enabled_colour if enabled else disabled_colour
-            self.transforms.append(Matrix44.fromTranslation(point))
-            self.colours.append(colour)
+        if len(fiducials) > 0:
+            self.transforms = translation_matrices(fiducials['points'])
+            self.colours = [enabled_colour if enabled else disabled_colour for enabled in fiducials['enabled']]
 
-        fiducial_mesh = create_sphere(size, 32, 32)
+        fiducial_mesh = fiducial_sphere(size)
         self.vertices = fiducial_mesh.vertices
         self.indices = fiducial_mesh.indices
         self.normals = fiducial_mesh.normals
@@ -118,15 +149,14 @@ class MeasurementPointEntity(Entity):
         enabled_colour = Colour(*settings.value(settings.Key.Measurement_Colour))
         disabled_colour = Colour(*settings.value(settings.Key.Measurement_Disabled_Colour))
         size = settings.value(settings.Key.Measurement_Size)
-        for point, enabled in points:
-            colour = enabled_colour if enabled else disabled_colour
-            self.transforms.append(Matrix44.fromTranslation(point))
-            self.colours.append(colour)
+        if len(points) > 0:
+            self.transforms = translation_matrices(points['points'])
+            self.colours = [enabled_colour if enabled else disabled_colour for enabled in points['enabled']]
 
         self.vertices = np.array(
             [[-size, 0., 0.], [size, 0., 0.], [0., -size, 0.], [0., size, 0.], [0., 0., -size], [0., 0., size]],
             dtype=np.float32)
-        self.indices = np.array([0, 1, 2, 3, 4, 5], dtype=np.uint32)
+        self.indices = AXIS_LINE_INDICES
 
     def node(self):
         """Creates scene node for measurement points
@@ -180,27 +210,19 @@ class MeasurementVectorEntity(Entity):
 
         self.alignment = 0 if alignment >= vectors.shape[2] else alignment
 
-        for k in range(vectors.shape[2]):
-            start_point = points.points
-
-            vertices = []
-            colour = []
-            ranges = []
-            count = 0
-            for j in range(0, vectors.shape[1] // 3):
-                end_point = start_point + size * vectors[:, j * 3:j * 3 + 3, k]
-
-                vertices.append(np.column_stack((start_point, end_point)).reshape(-1, 3))
-                if j < 2:
-                    colour.append(colours[j])
-                else:
-                    np.random.seed(j)
-                    colour.append(Colour(*np.random.random(3)))
-                count += len(vertices[-1])
-                ranges.append(count)
-            self.colours = colour
-            self.offsets = ranges
-            self.vertices.append(np.array(np.row_stack(vertices), dtype=np.float32))
+        point_count, vector_count, alignment_count = len(points), vectors.shape[1] // 3, vectors.shape[2]
+        start_points = np.broadcast_to(points.points[:, np.newaxis, :, np.newaxis],
+                                       (point_count, vector_count, 3, alignment_count))
+        end_points = start_points + size * vectors.reshape(point_count, vector_count, 3, alignment_count)
+        # vertices are ordered by alignment, then vector, then point with start and end points interleaved
+        vertices = np.stack((start_points, end_points), axis=2).transpose(4, 1, 0, 2, 3)
+        self.vertices = list(vertices.reshape(alignment_count, -1, 3).astype(np.float32))
+
+        self.colours = colours[:vector_count]
+        for j in range(2, vector_count):
+            np.random.seed(j)
+            self.colours.append(Colour(*np.random.random(3)))
+        self.offsets = list(range(2 * point_count, 2 * point_count * (vector_count + 1), 2 * point_count))
         self.indices = np.arange(0, len(self.vertices[-1]), dtype=np.uint32)
 
     def node(self):
@@ -216,6 +238,7 @@ class MeasurementVectorEntity(Entity):
         if not self.vertices:
             return measurement_vector_node
 
+        children = []
         for index, vertices in enumerate(self.vertices):
             child = BatchRenderNode(len(self.offsets))
             child.vertices = vertices
@@ -226,8 +249,9 @@ class MeasurementVectorEntity(Entity):
             child.render_primitive = Node.RenderPrimitive.Lines
             child.batch_offsets = self.offsets
             child.buildVertexBuffer()
+            children.append(child)
 
-            measurement_vector_node.addChild(child)
+        measurement_vector_node.addChildren(children)
 
         return measurement_vector_node
 
@@ -250,6 +274,7 @@ class InstrumentEntity(Entity):
         self.offsets = []
         self.colours = []
         self.transforms = []
+        self.bounding_boxes = []
         for mesh, transform in self.instrument.positioning_stack.model():
             self._updateParams(mesh, transform)
         self.keys = {Attributes.Positioner.value: len(self.offsets)}
@@ -277,6 +302,7 @@ class InstrumentEntity(Entity):
         self._normals.append(mesh.normals)
         self.transforms.append(transform)
         self.colours.append(mesh.colour)
+        self.bounding_boxes.append(mesh.bounding_box)
         self._count += len(mesh.vertices)
         self._index_offset += len(mesh.indices)
         self.offsets.append(self._index_offset)
@@ -316,6 +342,7 @@ class InstrumentEntity(Entity):
         instrument_node.per_object_colour = self.colours
         instrument_node.normals = self.normals
         instrument_node.per_object_transform = self.transforms
+        instrument_node.per_object_bounding_box = self.bounding_boxes
         instrument_node.batch_offsets = self.offsets
         instrument_node.buildVertexBuffer()
 
@@ -14,6 +14,16 @@ from ..geometry.mesh import BoundingBox
 from ..geometry.primitive import create_cuboid
 from ...config import settings
 
+# Shared read-only index buffers for line primitives that are rebuilt frequently
+AXIS_LINE_INDICES = np.arange(6, dtype=np.uint32)
+AXIS_LINE_INDICES.setflags(write=False)
+BOX_EDGE_INDICES = np.array([0, 1, 1, 3, 3, 2, 2, 0, 4, 5, 5, 7, 7, 6, 6, 4, 0, 4, 1, 5, 2, 6, 3, 7], dtype=np.uint32)
+BOX_EDGE_INDICES.setflags(write=False)
+# Shared read-only identity transform for nodes that are never moved. Because the matrix is shared, in-place
+# multiplication (@=) and element writes raise a ValueError, nodes must assign a new matrix to transform instead
+IDENTITY_TRANSFORM = Matrix44.identity()
+np.asarray(IDENTITY_TRANSFORM).setflags(write=False)
+
 
 class Node:
     """Creates Node object.
@@ -21,6 +31,9 @@ class Node:
     :param mesh: mesh to add to node
     :type mesh: Union[Mesh, None]
     """
+    __slots__ = ('parent', 'children', 'buffer', '_vertices', '_indices', '_normals', '_bounding_box', '_colour',
+                 '_render_mode', 'render_primitive', 'transform', '_visible', 'selected', 'outlined')
+
     @unique
     class RenderMode(Enum):
         """Mode for rendering"""
@@ -47,14 +60,14 @@ class Node:
             self._bounding_box = None
             self._colour = Colour.black()
         else:
-            self.vertices = mesh.vertices
+            self._setVertices(mesh.vertices, mesh.bounding_box)
             self.indices = mesh.indices
             self.normals = mesh.normals
             self._colour = mesh.colour
 
         self._render_mode = Node.RenderMode.Solid
         self.render_primitive = Node.RenderPrimitive.Triangles
-        self.transform = Matrix44.identity()
+        self.transform = IDENTITY_TRANSFORM
         self._visible = True
         self.selected = False
         self.outlined = False
@@ -104,7 +117,7 @@ class Node:
 
     @normals.setter
     def normals(self, value):
-        self._normals = value.astype(np.float32)
+        self._normals = value.astype(np.float32, copy=False)
 
     @property
     def indices(self):
@@ -117,7 +130,7 @@ class Node:
 
     @indices.setter
     def indices(self, value):
-        self._indices = value.astype(np.uint32)
+        self._indices = value.astype(np.uint32, copy=False)
 
     @property
     def vertices(self):
@@ -130,12 +143,22 @@ class Node:
 
     @vertices.setter
     def vertices(self, value):
-        self._vertices = value.astype(np.float32)
-        max_pos, min_pos = BoundingBox.fromPoints(self._vertices).bounds
-        for node in self.children:
-            max_pos = np.maximum(node.bounding_box.max, max_pos)
-            min_pos = np.minimum(node.bounding_box.min, min_pos)
-        self.bounding_box = BoundingBox(max_pos, min_pos)
+        self._setVertices(value)
+
+    def _setVertices(self, vertices, bounding_box=None):
+        """Sets vertices and updates the bounding box of the node. The bounding box of the vertices
+        is computed if not provided.
+
+        :param vertices: array of vertices
+        :type vertices: numpy.ndarray
+        :param bounding_box: bounding box of the vertices
+        :type bounding_box: Union[BoundingBox, None]
+        """
+        self._vertices = vertices.astype(np.float32, copy=False)
+        if bounding_box is None:
+            bounding_box = BoundingBox.fromPoints(self._vertices)
+
+        self.bounding_box = BoundingBox.merge([bounding_box, *(node.bounding_box for node in self.children)])
 
     @property
     def colour(self):
@@ -204,17 +227,26 @@ class Node:
         :param child_node: child node to add
         :type child_node: Node
         """
-        if child_node.isEmpty():
-            return
+        self.addChildren([child_node])
 
-        child_node.parent = self
-        self.children.append(child_node)
+    def addChildren(self, child_nodes):
+        """Adds children to the node and recomputes the bounding box once for all the children.
+        Empty child nodes are not added
+
+        :param child_nodes: child nodes to add
+        :type child_nodes: List[Node]
+        """
+        boxes = [] if self.bounding_box is None else [self.bounding_box]
+        for child_node in child_nodes:
+            if child_node.isEmpty():
+                continue
 
-        max_pos, min_pos = child_node.bounding_box.bounds
-        if self.bounding_box is not None:
-            max_pos = np.maximum(self.bounding_box.max, max_pos)
-            min_pos = np.minimum(self.bounding_box.min, min_pos)
-        self.bounding_box = BoundingBox(max_pos, min_pos)
+            child_node.parent = self
+            self.children.append(child_node)
+            boxes.append(child_node.bounding_box)
+
+        if boxes:
+            self.bounding_box = BoundingBox.merge(boxes)
 
     def flatten(self):
         """Flattens the tree formed by nested nodes recursively
@@ -350,13 +382,16 @@ class BatchRenderNode(Node):
     :param object_count: number of drawable objects
     :type object_count: int
     """
+    __slots__ = ('instanced', 'batch_offsets', 'per_object_colour', 'per_object_transform', 'per_object_bounding_box')
+
     def __init__(self, object_count, instanced=False):
         super().__init__()
 
         self.instanced = instanced
         self.batch_offsets = [0] * object_count
         self.per_object_colour = [Colour.black()] * object_count
-        self.per_object_transform = [Matrix44.identity()] * object_count
+        self.per_object_transform = [IDENTITY_TRANSFORM] * object_count
+        self.per_object_bounding_box = []
         self.selected = [False] * object_count
         self.resetOutline()
 
@@ -372,7 +407,9 @@ class BatchRenderNode(Node):
     @property
     def bounding_box(self):
         """Gets and sets node bounding box. The bounding box is transformed using
-        the node's transformation matrix, so it may not be tight
+        the node's transformation matrix, so it may not be tight. The untransformed
+        bounding box of each object is taken from per_object_bounding_box if provided
+        otherwise it is computed from the vertices.
 
         :return: node render mode
         :rtype: Union[BoundingBox, None]
@@ -382,11 +419,17 @@ class BatchRenderNode(Node):
 
         boxes = []
         start = 0
+        # instances share the same vertices so the untransformed box is only computed once
+        instance_box = BoundingBox.fromPoints(np.take(self.vertices, self.indices, axis=0)) if self.instanced else None
         for index, end in enumerate(self.batch_offsets):
-            t = Matrix44.identity() if not self.per_object_transform else self.per_object_transform[index]
-            vertices = self.vertices[self.indices] if self.instanced else self.vertices[self.indices[start:end]]
-            max_pos, min_pos = BoundingBox.fromPoints(vertices).bounds
-            boxes.append(BoundingBox(max_pos, min_pos).transform(t))
+            t = IDENTITY_TRANSFORM if not self.per_object_transform else self.per_object_transform[index]
+            if self.per_object_bounding_box:
+                box = self.per_object_bounding_box[index]
+            elif self.instanced:
+                box = instance_box
+            else:
+                box = BoundingBox.fromPoints(np.take(self.vertices, self.indices[start:end], axis=0))
+            boxes.append(box.transform(t))
             start = end
 
         return BoundingBox.merge(boxes)
@@ -402,7 +445,7 @@ class BatchRenderNode(Node):
             else:
                 GL.glColor4f(*self.per_object_colour[index].rgbaf)
             GL.glPushMatrix()
-            t = Matrix44.identity() if not self.per_object_transform else self.per_object_transform[index]
+            t = IDENTITY_TRANSFORM if not self.per_object_transform else self.per_object_transform[index]
             GL.glMultTransposeMatrixf(t)
 
             if self.instanced:
@@ -435,11 +478,11 @@ class VolumeNode(Node):
         self.transfer_function = Texture1D(volume.curve.transfer_function)
 
         volume_mesh = create_cuboid(2, 2, 2)
-        self.vertices = volume_mesh.vertices
+        self._setVertices(volume_mesh.vertices, volume_mesh.bounding_box)
         self.indices = volume_mesh.indices
 
         self.extent = volume.extent
-        self._transform = Matrix44.identity()
+        self._transform = IDENTITY_TRANSFORM
         self.model_matrix = volume.transform_matrix
 
         self.scale_matrix = np.diag([*(0.5 * self.extent), 1])
@@ -3,7 +3,7 @@ import numpy as np
 from OpenGL import GL, error
 from PyQt6 import QtCore, QtGui, QtOpenGLWidgets
 from .camera import Camera, world_to_screen, screen_to_world
-from .node import Node, BatchRenderNode, TextNode
+from .node import Node, BatchRenderNode, TextNode, AXIS_LINE_INDICES, BOX_EDGE_INDICES
 from .scene import Scene
 from .shader import DefaultShader, GouraudShader, VolumeShader, TextShader
 from ..geometry.colour import Colour
@@ -173,9 +173,8 @@ class OpenGLRenderer(QtOpenGLWidgets.QOpenGLWidget):
         vertices = np.array(
             [[-size, 0., 0.], [size, 0., 0.], [0., -size, 0.], [0., size, 0.], [0., 0., -size], [0., 0., size]],
             dtype=np.float32)
-        indices = np.array([0, 1, 2, 3, 4, 5], dtype=np.uint32)
         node.vertices = vertices
-        node.indices = indices
+        node.indices = AXIS_LINE_INDICES
         for index, pick in enumerate(self.picks):
             point, selected = pick
             node.selected[index] = selected
@@ -289,8 +288,7 @@ class OpenGLRenderer(QtOpenGLWidgets.QOpenGLWidget):
             [[min_x, min_y, min_z], [min_x, max_y, min_z], [max_x, min_y, min_z], [max_x, max_y, min_z],
              [min_x, min_y, max_z], [min_x, max_y, max_z], [max_x, min_y, max_z], [max_x, max_y, max_z]],
             dtype=np.float32)
-        node.indices = np.array([0, 1, 1, 3, 3, 2, 2, 0, 4, 5, 5, 7, 7, 6, 6, 4, 0, 4, 1, 5, 2, 6, 3, 7],
-                                dtype=np.uint32)
+        node.indices = BOX_EDGE_INDICES
         node.colour = Colour(0.9, 0.4, 0.4)
         node.buildVertexBuffer()
         node.draw(self)
@@ -312,7 +310,7 @@ class OpenGLRenderer(QtOpenGLWidgets.QOpenGLWidget):
                                   [0.0, 0.0, 0.0], [0.0, 0.0, scale]],
                                  dtype=np.float32)
 
-        node.indices = np.array([0, 1, 2, 3, 4, 5], dtype=np.uint32)
+        node.indices = AXIS_LINE_INDICES
         node.per_object_colour = [Colour(1.0, 0.0, 0.0), Colour(0.0, 1.0, 0.0), Colour(0.0, 0.0, 1.0)]
         node.batch_offsets = [2, 4, 6]
         node.buildVertexBuffer()
@@ -1,10 +1,14 @@
+import tracemalloc
 import unittest
+import unittest.mock as mock
 import numpy as np
-from sscanss.core.math import Vector3, matrix_from_xyz_eulers, Plane, Line
-from sscanss.core.geometry import (Mesh, MeshGroup, closest_triangle_to_point, mesh_plane_intersection, create_tube,
-                                   segment_plane_intersection, BoundingBox, create_cuboid, path_length_calculation,
-                                   compute_face_normals, segment_triangle_intersection, point_selection, Volume, Curve,
-                                   volume_plane_intersection, volume_ray_intersection, line_box_intersection)
+from sscanss.core.math import Vector3, Matrix44, matrix_from_xyz_eulers, Plane, Line
+from sscanss.core.geometry import (Mesh, MeshGroup, closest_triangle_to_point, mesh_plane_intersection, MeshPlaneSlicer,
+                                   create_tube, segment_plane_intersection, segments_plane_intersection, BoundingBox,
+                                   create_cuboid, path_length_calculation, compute_face_normals,
+                                   segment_triangle_intersection, point_selection, Volume, Curve,
+                                   volume_plane_intersection, volume_ray_intersection, line_box_intersection,
+                                   TriangleBVH, point_triangle_distance, triangle_distance_data, plane_axis)
 
 
 class TestMeshClass(unittest.TestCase):
@@ -27,7 +31,12 @@ class TestMeshClass(unittest.TestCase):
 
         np.testing.assert_array_almost_equal(mesh.vertices, vertices, decimal=5)
         np.testing.assert_array_almost_equal(mesh.normals, normals, decimal=5)
+        self.assertEqual(mesh.vertices.dtype, np.float32)
+        self.assertEqual(mesh.normals.dtype, np.float32)
         np.testing.assert_array_equal(mesh.indices, [1, 0, 2])
+        self.assertEqual(mesh.indices.dtype, np.uint32)
+        np.testing.assert_array_equal(mesh.face_indices, [[1, 0, 2]])
+        self.assertTrue(np.shares_memory(mesh.face_indices, mesh.indices))
 
         mesh = Mesh(vertices, indices, normals, clean=True)
         expected = np.array([[0, 0, 1], [0, 0, 1], [0, 0, 1]])
@@ -77,6 +86,8 @@ class TestMeshClass(unittest.TestCase):
         np.testing.assert_array_almost_equal(self.mesh_1.vertices, vertices, decimal=5)
         np.testing.assert_array_almost_equal(self.mesh_1.normals, normals, decimal=5)
         np.testing.assert_array_equal(self.mesh_1.indices, indices)
+        np.testing.assert_array_almost_equal(self.mesh_1.bounding_box.max, [7, 8, 9], decimal=5)
+        np.testing.assert_array_almost_equal(self.mesh_1.bounding_box.min, [1, 2, 3], decimal=5)
 
         split_mesh = self.mesh_1.remove(3)
         np.testing.assert_array_equal(self.mesh_1.indices, np.array([2, 1, 0]))
@@ -86,6 +97,16 @@ class TestMeshClass(unittest.TestCase):
         np.testing.assert_array_almost_equal(self.mesh_1.normals, normals[0:3, :], decimal=5)
         np.testing.assert_array_almost_equal(split_mesh.normals, normals[3:, :], decimal=5)
 
+        # appending after a split should not overwrite the split mesh
+        self.mesh_1.append(self.mesh_2)
+        self.mesh_1.append(self.mesh_2)
+        np.testing.assert_array_almost_equal(split_mesh.vertices, vertices[3:, :], decimal=5)
+        np.testing.assert_array_almost_equal(self.mesh_1.vertices[3:6], vertices[3:, :], decimal=5)
+        np.testing.assert_array_almost_equal(self.mesh_1.vertices[6:], vertices[3:, :], decimal=5)
+        np.testing.assert_array_equal(self.mesh_1.indices, [2, 1, 0, 4, 3, 5, 3, 4, 5, 7, 6, 8, 6, 7, 8])
+        np.testing.assert_array_equal(self.mesh_1.face_indices[-1], [6, 7, 8])
+        np.testing.assert_array_almost_equal(self.mesh_1.normals[6:], normals[3:, :], decimal=5)
+
     def testTransform(self):
         angles = np.radians([30, 60, 90])
         matrix = matrix_from_xyz_eulers(Vector3(angles))
@@ -113,6 +134,8 @@ class TestMeshClass(unittest.TestCase):
         np.testing.assert_array_almost_equal(self.mesh_1.vertices, expected_vertices, decimal=5)
         np.testing.assert_array_almost_equal(self.mesh_1.normals, expected_normals, decimal=5)
         np.testing.assert_array_equal(self.mesh_1.indices, np.array([2, 1, 0]))
+        np.testing.assert_array_almost_equal(self.mesh_1.bounding_box.max, expected_vertices.max(axis=0), decimal=5)
+        np.testing.assert_array_almost_equal(self.mesh_1.bounding_box.min, expected_vertices.min(axis=0), decimal=5)
 
         transform_matrix = np.eye(4, 4)
         transform_matrix[0:3, 0:3] = matrix.transpose()
@@ -132,6 +155,11 @@ class TestMeshClass(unittest.TestCase):
         self.assertIsNot(mesh.vertices, self.mesh_1.vertices)
         self.assertIsNot(mesh.normals, self.mesh_1.normals)
         self.assertIsNot(mesh.indices, self.mesh_1.indices)
+        np.testing.assert_array_equal(mesh.face_indices, self.mesh_1.face_indices)
+        np.testing.assert_array_almost_equal(mesh.bounding_box.max, self.mesh_1.bounding_box.max, decimal=5)
+        np.testing.assert_array_almost_equal(mesh.bounding_box.min, self.mesh_1.bounding_box.min, decimal=5)
+        mesh.bounding_box.translate(1.0)
+        np.testing.assert_array_almost_equal(mesh.bounding_box.min, self.mesh_1.bounding_box.min + 1.0, decimal=5)
 
     def testMeshGroup(self):
         group = MeshGroup()
@@ -182,6 +210,7 @@ class TestBoundingBoxClass(unittest.TestCase):
         np.testing.assert_array_almost_equal(box.min, min_position, decimal=5)
         self.assertIsNot(min_position, box.min)  # make sure this are not the same object
         np.testing.assert_array_almost_equal(box.center, [0.0, 0.0, 0.0], decimal=5)
+        np.testing.assert_array_almost_equal(box.half_extent, [1.0, 2.0, 3.0], decimal=5)
         np.testing.assert_array_almost_equal(box.radius, 3.74166, decimal=5)
 
         points = [[1.0, 1.0, 0.0], [-1.0, 0.0, -1.0], [0.0, -1.0, 1.0]]
@@ -191,6 +220,12 @@ class TestBoundingBoxClass(unittest.TestCase):
         np.testing.assert_array_almost_equal(box.center, [0.0, 0.0, 0.0], decimal=5)
         np.testing.assert_array_almost_equal(box.radius, 1.73205, decimal=5)
 
+        points = np.random.default_rng(5).uniform(-10, 10, (1001, 3)).astype(np.float32)
+        for count in [1001, 992, 31]:
+            box = BoundingBox.fromPoints(points[:count])
+            np.testing.assert_array_equal(box.max, points[:count].max(axis=0))
+            np.testing.assert_array_equal(box.min, points[:count].min(axis=0))
+
     def testTranslation(self):
         box = BoundingBox([1, 1, 1], [-1, -1, -1])
         box.translate(-2)
@@ -205,6 +240,13 @@ class TestBoundingBoxClass(unittest.TestCase):
         np.testing.assert_array_almost_equal(box.center, [-1.0, 0.0, 1.0], decimal=5)
         np.testing.assert_array_almost_equal(box.radius, 1.73205, decimal=5)
 
+        matrix = Matrix44.fromTranslation([1, 0, -1])
+        matrix[:3, :3] = matrix_from_xyz_eulers(Vector3(np.radians([0, 0, 90])))
+        box = box.transform(matrix)
+        np.testing.assert_array_almost_equal(box.max, [2.0, 0.0, 1.0], decimal=5)
+        np.testing.assert_array_almost_equal(box.min, [0.0, -2.0, -1.0], decimal=5)
+        np.testing.assert_array_almost_equal(box.half_extent, [1.0, 1.0, 1.0], decimal=5)
+
     def testMerge(self):
         self.assertRaises(ValueError, BoundingBox.merge, [])
         boxes = [BoundingBox([1, 1, 1], [-1, -1, -1]), BoundingBox([1, 1, 2], [-1, -1, 1.5])]
@@ -290,6 +332,78 @@ class TestGeometryFunctions(unittest.TestCase):
         np.testing.assert_array_almost_equal(face[0], faces[2], decimal=5)
         np.testing.assert_array_almost_equal(face[1], faces[9], decimal=5)
 
+        tube = create_tube(2, 3, 4, 64, 8)
+        faces = tube.vertices[tube.indices].reshape(-1, 9)
+        bvh = TriangleBVH(faces, leaf_size=4)
+        self.assertTrue(np.all(bvh.count[bvh.left == -1] <= 4))
+        np.testing.assert_array_equal(np.sort(bvh.face_index), np.arange(faces.shape[0]))
+        points = np.array([[0.0, 0.0, 0.0], [5.0, -1.0, 2.0], [-2.5, 1.9, 0.3], [0.1, 10.0, -0.2]])
+        points = np.vstack((points, np.random.default_rng(10).uniform(-5, 5, (12, 3))))
+        dist = point_triangle_distance(points, *triangle_distance_data(faces))
+        np.testing.assert_array_equal(bvh.closestFaces(points), dist.argmin(axis=1))
+        np.testing.assert_array_equal(bvh.closestFaces(points, max_sq_dist=4.0),
+                                      np.where(dist.min(axis=1) <= 4.0, dist.argmin(axis=1), -1))
+        self.assertEqual(bvh.closestFaces(points[3], max_sq_dist=1.0)[0], -1)
+        index = bvh.closestFaces(points, accept_sq_dist=1.0)
+        accepted = dist[np.arange(points.shape[0]), index]
+        np.testing.assert_array_equal(accepted[accepted > 1.0], dist.min(axis=1)[accepted > 1.0])
+        np.testing.assert_array_equal(bvh.closestFaces(points, accept_sq_dist=0.0), dist.argmin(axis=1))
+        index = bvh.closestFaces(points, max_sq_dist=4.0, accept_sq_dist=25.0)
+        np.testing.assert_array_equal(index < 0, dist.min(axis=1) > 4.0)
+        self.assertTrue(np.all(dist[np.arange(points.shape[0]), index][index >= 0] <= 4.0))
+
+        points = points[4:]
+        face = closest_triangle_to_point(faces, points)
+        for i, point in enumerate(points):
+            np.testing.assert_array_almost_equal(face[i], closest_triangle_to_point(faces, [point])[0], decimal=5)
+
+        for count in [2, 12]:
+            far_points = np.vstack((points[:count - 1], [[0.0, 50.0, 0.0]]))
+            face = closest_triangle_to_point(faces, far_points, max_sq_dist=400.0)
+            self.assertTrue(np.isnan(face[-1]).all())
+            np.testing.assert_array_almost_equal(face[:-1],
+                                                 closest_triangle_to_point(faces, points[:count - 1]),
+                                                 decimal=5)
+            self.assertEqual(face.dtype, closest_triangle_to_point(faces, points[:count]).dtype)
+
+            face = closest_triangle_to_point(faces, points[:count], accept_sq_dist=1.0)
+            face_dist = np.diagonal(point_triangle_distance(points[:count], *triangle_distance_data(face)))
+            dist = point_triangle_distance(points[:count], *triangle_distance_data(faces)).min(axis=1)
+            self.assertTrue(np.all((face_dist <= 1.0) | np.isclose(face_dist, dist)))
+
+    @mock.patch('sscanss.core.geometry.intersection.BVH_BATCH_SIZE', 2**12)
+    def testClosestTriangleToFewPoints(self):
+        tube = create_tube(2, 3, 4, 512, 32)
+        faces = tube.vertices[tube.indices].reshape(-1, 9)
+        points = np.random.default_rng(7).uniform(-5, 5, (8, 3))
+
+        tracemalloc.start()
+        try:
+            face = closest_triangle_to_point(faces, points)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        # testing every point with every face at once needs at least 72 bytes per point and face
+        self.assertLess(peak, points.shape[0] * faces.shape[0] * 72 / 8)
+        for i, point in enumerate(points):
+            dist = point_triangle_distance(point, *triangle_distance_data(faces))
+            np.testing.assert_array_equal(face[i], faces[np.argmin(dist)])
+
+    def testPointTriangleDistance(self):
+        faces = np.array([[0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0]])
+        face_data = triangle_distance_data(faces)
+        # points in the face, vertex and edge regions of the triangle
+        points = np.array([[0.2, 0.2, 1.0], [0.25, 0.25, 0.0], [-1.0, -1.0, 0.0], [2.0, -1.0, 0.0], [-1.0, 2.0, 0.5],
+                           [0.5, -1.0, 0.0], [1.0, 1.0, 0.0], [-1.0, 0.5, 2.0]])
+        expected = [1.0, 0.0, 2.0, 2.0, 2.25, 1.0, 0.5, 5.0]
+
+        dist = point_triangle_distance(points, *face_data)
+        self.assertEqual(dist.shape, (8, 1))
+        np.testing.assert_array_almost_equal(dist[:, 0], expected, decimal=5)
+        for point, value in zip(points, expected):
+            np.testing.assert_array_almost_equal(point_triangle_distance(point, *face_data), [value], decimal=5)
+
     def testSegmentPlaneIntersection(self):
         point_a, point_b = np.array([1.0, 0.0, 0.0]), np.array([-1.0, 0.0, 0.0])
         plane = Plane.fromCoefficient(1.0, 0.0, 0.0, 0.0)
@@ -312,6 +426,12 @@ class TestGeometryFunctions(unittest.TestCase):
         intersection = segment_plane_intersection(point_a, point_b, plane)
         self.assertIsNone(intersection)
 
+        points_a = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.5, 1.0, 0.0], [0.5, 1.0, 0.0]])
+        points_b = np.array([[-1.0, 0.0, 0.0], [0.0, -1.0, 0.0], [0.0, -1.0, 0.0], [1.0, -1.0, 0.0]])
+        intersections, flags = segments_plane_intersection(points_a, points_b, plane)
+        np.testing.assert_array_equal(flags, [True, False, True, False])
+        np.testing.assert_array_almost_equal(intersections[flags], [[0.0, 0.0, 0.0], [0.0, -1.0, 0.0]], decimal=5)
+
     def testMeshPlaneIntersection(self):
         np.array([[1.0, 1.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0], [1.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0]])
 
@@ -334,6 +454,13 @@ class TestGeometryFunctions(unittest.TestCase):
         plane = Plane.fromCoefficient(1.0, 0.0, 0.0, -0.5)
         segments = mesh_plane_intersection(mesh, plane)
         self.assertEqual(len(segments), 4)
+        expected = [[0.5, 0.0, 0.0], [0.5, 0.5, 0.0], [0.5, 0.5, 0.0], [0.5, 1.0, 0.0]]
+        np.testing.assert_array_almost_equal(segments, expected, decimal=5)
+
+        # plane intersects a single face
+        plane = Plane(np.array([1.0, -1.0, 0.0]) / np.sqrt(2), np.array([0.0, 0.5, 0.0]))
+        segments = mesh_plane_intersection(mesh, plane)
+        np.testing.assert_array_almost_equal(segments, [[0.0, 0.5, 0.0], [0.5, 1.0, 0.0]], decimal=5)
 
         # plane is flush with face
         # This is currently expected to return nothing
@@ -341,6 +468,37 @@ class TestGeometryFunctions(unittest.TestCase):
         segments = mesh_plane_intersection(mesh, plane)
         self.assertEqual(len(segments), 0)
 
+        def sorted_segments(segments):
+            segments = np.asarray(segments, dtype=float).reshape(-1, 2, 3).round(3)
+            return np.array(sorted(sorted(map(tuple, segment)) for segment in segments)).reshape(-1, 3)
+
+        mesh = create_tube(5, 10, 20, 20, 10)
+        slicer = MeshPlaneSlicer(mesh)
+        for normal in ([0.0, 1.0, 0.0], [0.0, 0.0, -1.0], [1.0, 2.0, 3.0], [0.0, 1.0, 1.0]):
+            normal = np.array(normal) / np.linalg.norm(normal)
+            for distance in (-11.0, -4.3, 2.5, 7.1):
+                plane = Plane(normal, normal * distance)
+                # reference segments are found one face at a time from the edges that cross the plane
+                expected = []
+                for face in mesh.vertices[mesh.face_indices].astype(float):
+                    dist = (face - plane.point) @ plane.normal
+                    points = [
+                        face[i] + dist[i] / (dist[i] - dist[j]) * (face[j] - face[i])
+                        for i, j in ((0, 1), (1, 2), (2, 0)) if dist[i] * dist[j] < 0
+                    ]
+                    if len(points) == 2:
+                        expected.extend(points)
+
+                segments = slicer.intersect(plane)
+                self.assertEqual(len(segments), len(expected))
+                np.testing.assert_array_almost_equal(sorted_segments(segments), sorted_segments(expected), decimal=3)
+
+        self.assertEqual(plane_axis(np.array([0.0, -1.0, 0.0])), 1)
+        self.assertEqual(plane_axis(np.array([0.0, 0.6, 0.8])), -1)
+        segments = slicer.intersect(Plane(np.array([0.0, 0.0, -1.0]), np.array([0.0, 0.0, 3.3])))
+        self.assertGreater(len(segments), 0)
+        np.testing.assert_array_equal(segments[:, 2], 3.3)
+
     def testSegmentTriangleIntersection(self):
         axis = np.array([0.0, 0.0, 1.0])
         origin = np.array([0.0, 0.0, 0.0])
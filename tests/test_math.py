@@ -372,6 +372,16 @@ class TestMath(unittest.TestCase):
         self.assertTrue(isinstance(result, Vector))
         np.testing.assert_array_equal(result, [30, 70])
 
+        m = Matrix(2, 2, [[1.0, 2.0], [3.0, 4.0]])
+        m1 = m
+        m1 @= Matrix(2, 2, [[0.0, 1.0], [1.0, 0.0]])
+        self.assertIs(m1, m)
+        np.testing.assert_array_almost_equal(m, [[2.0, 1.0], [4.0, 3.0]], decimal=5)
+        np.asarray(m).setflags(write=False)
+        with self.assertRaises(ValueError):
+            m1 @= Matrix(2, 2, [[0.0, 1.0], [1.0, 0.0]])
+        np.testing.assert_array_almost_equal(m, [[2.0, 1.0], [4.0, 3.0]], decimal=5)
+
         self.assertRaises(ValueError, lambda: Matrix33() + Matrix44())
         self.assertRaises(ValueError, lambda: Matrix33() - Matrix44())
         self.assertRaises(ValueError, lambda: Matrix33() * Matrix44())
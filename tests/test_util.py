@@ -3,10 +3,10 @@ import unittest.mock as mock
 import numpy as np
 from PyQt6.QtGui import QColor, QFont
 from sscanss.__version import Version
-from sscanss.core.math import Vector3, Plane, clamp, trunc, map_range, is_close
+from sscanss.core.math import Vector3, Matrix44, Plane, clamp, trunc, map_range, is_close, squared_norm
 from sscanss.core.geometry import create_plane, Colour, Mesh, Volume
 from sscanss.core.scene import (SampleEntity, PlaneEntity, MeasurementPointEntity, MeasurementVectorEntity, Camera,
-                                Scene, Node, validate_instrument_scene_size, TextNode)
+                                Scene, Node, BatchRenderNode, validate_instrument_scene_size, TextNode)
 from sscanss.core.util import to_float, Directions, Attributes, compact_path, find_duplicates, ProgressReport
 from tests.helpers import FakeSettings, TestSignal, create_mock
 
@@ -119,6 +119,14 @@ class TestNode(unittest.TestCase):
         np.testing.assert_array_almost_equal(box.center, np.array([0.0, 0.0, 0.0]), decimal=5)
         self.assertAlmostEqual(box.radius, 0.8660254, 5)
 
+        node = Node()
+        node.addChildren([Node(mesh), Node(), Node(mesh_1), Node(mesh_2)])
+        self.assertEqual(len(node.children), 3)
+        self.assertTrue(all(child.parent is node for child in node.children))
+        box = node.bounding_box
+        np.testing.assert_array_almost_equal(box.max, np.array([0.5, 0.5, 0.5]), decimal=5)
+        np.testing.assert_array_almost_equal(box.min, np.array([-0.5, -0.5, -0.5]), decimal=5)
+
         # Nested Nodes
         node = Node()
         self.assertTrue(node.isEmpty())
@@ -188,6 +196,26 @@ class TestNode(unittest.TestCase):
         np.testing.assert_array_almost_equal(box.center, np.array([0.0, 0.0, 0.0]), decimal=5)
         self.assertAlmostEqual(box.radius, 0.707106, 5)
 
+    def testBatchNodeBounds(self):
+        mesh = create_plane(Plane(np.array([1.0, 0.0, 0.0]), np.array([0.0, 0.0, 0.0])))
+        mesh_1 = create_plane(Plane(np.array([0.0, 1.0, 0.0]), np.array([0.0, 0.0, 0.0])))
+
+        node = BatchRenderNode(2)
+        self.assertIsNone(node.bounding_box)
+        node.vertices = np.vstack((mesh.vertices, mesh_1.vertices))
+        node.indices = np.concatenate((mesh.indices, mesh_1.indices + len(mesh.vertices)))
+        node.batch_offsets = [len(mesh.indices), len(mesh.indices) + len(mesh_1.indices)]
+        node.per_object_transform = [Matrix44.fromTranslation([1.0, 0.0, 0.0]), Matrix44.identity()]
+
+        box = node.bounding_box
+        np.testing.assert_array_almost_equal(box.max, np.array([1.0, 0.5, 0.5]), decimal=5)
+        np.testing.assert_array_almost_equal(box.min, np.array([-0.5, -0.5, -0.5]), decimal=5)
+
+        node.per_object_bounding_box = [mesh.bounding_box, mesh_1.bounding_box]
+        box = node.bounding_box
+        np.testing.assert_array_almost_equal(box.max, np.array([1.0, 0.5, 0.5]), decimal=5)
+        np.testing.assert_array_almost_equal(box.min, np.array([-0.5, -0.5, -0.5]), decimal=5)
+
     def testNodeProperties(self):
         mesh = create_plane(Plane(np.array([1.0, 0.0, 0.0]), np.array([0.0, 0.0, 0.0])))
 
@@ -330,6 +358,14 @@ class TestUtil(unittest.TestCase):
         value = map_range(-1, 0, 0, 100, -0.8)
         self.assertAlmostEqual(value, 20, 5)
 
+    def testSquaredNorm(self):
+        self.assertAlmostEqual(squared_norm(np.array([1.0, -2.0, 2.0])), 9.0, 5)
+
+        vectors = np.array([[[0.0, 0.0, 0.0], [3.0, 4.0, 0.0]], [[0.5, 0.5, 0.5], [-1.0, 0.0, 1.0]]], np.float32)
+        value = squared_norm(vectors)
+        self.assertEqual(value.dtype, np.float32)
+        np.testing.assert_array_almost_equal(value, [[0.0, 25.0], [0.75, 2.0]], decimal=5)
+
     def testCompactPath(self):
         self.assertEqual(compact_path("", 10), "")
         self.assertEqual(compact_path("abcdef", 5), "a...f")
@@ -5,10 +5,10 @@ from matplotlib.backend_bases import MouseEvent
 import numpy as np
 from PyQt6.QtCore import Qt, QPoint, QPointF, QEvent
 from PyQt6.QtGui import QColor, QMouseEvent, QBrush, QAction
-from PyQt6.QtWidgets import QFileDialog, QMessageBox, QLabel
+from PyQt6.QtWidgets import QFileDialog, QMessageBox, QLabel, QGraphicsPathItem
 from sscanss.themes import ThemeManager, IconEngine
 from sscanss.core.util import PointType, POINT_DTYPE, CommandID, TransformType, Attributes
-from sscanss.core.geometry import Mesh, Volume
+from sscanss.core.geometry import Mesh, Volume, MeshPlaneSlicer, create_tube
 from sscanss.core.instrument.simulation import SimulationResult, Simulation
 from sscanss.core.instrument.robotics import IKSolver, IKResult, SerialManipulator, Link
 from sscanss.core.instrument.instrument import Script, PositioningStack, Instrument
@@ -20,7 +20,7 @@ from sscanss.core.util import (StatusBar, ColourPicker, FileDialog, FilePicker,
 from sscanss.app.dialogs import (SimulationDialog, ScriptExportDialog, PathLengthPlotter, PointManager, VectorManager,
                                  DetectorControl, JawControl, PositionerControl, TransformDialog, AlignmentErrorDialog,
                                  CalibrationErrorDialog, VolumeLoader, InstrumentCoordinatesDialog, CurveEditor,
-                                 SampleProperties, InsertPrimitiveDialog, ProgressDialog)
+                                 SampleProperties, InsertPrimitiveDialog, ProgressDialog, PickPointDialog)
 from sscanss.app.widgets import PointModel, AlignmentErrorModel, ErrorDetailModel
 from sscanss.app.window.presenter import MainWindowPresenter
 from sscanss.app.window.view import Updater
@@ -2355,6 +2355,66 @@ class TestInsertPrimitiveDialog(unittest.TestCase):
                     self.assertFalse(self.dialog.create_primitive_button.isEnabled())
 
 
+class TestPickPointDialog(unittest.TestCase):
+    @mock.patch("sscanss.app.window.presenter.MainWindowModel", autospec=True)
+    def setUp(self, model_mock):
+        self.view = TestView()
+        self.model_mock = model_mock
+        self.model_mock.return_value.instruments = [dummy]
+        self.model_mock.return_value.sample_changed = TestSignal()
+        self.model_mock.return_value.measurement_points_changed = TestSignal()
+        self.model_mock.return_value.measurement_points = np.recarray((0, ), dtype=POINT_DTYPE)
+        self.mesh = create_tube(5, 10, 20, 20, 10)
+        self.model_mock.return_value.sample = self.mesh
+        self.presenter = MainWindowPresenter(self.view)
+        self.view.presenter = self.presenter
+        self.view.scenes = mock.create_autospec(SceneManager)
+        self.view.themes = mock.create_autospec(ThemeManager)
+        self.view.themes.theme_changed = TestSignal()
+        self.view.themes.scene_path = QColor()
+        self.view.themes.scene_highlight = QColor()
+        self.view.themes.scene_anchor = QColor()
+        self.view.themes.scene_bounds = QColor()
+        self.view.themes.scene_grid = QColor()
+        self.view.show_measurement_labels_action = QAction()
+        self.view.size_label = QLabel()
+        self.view.cursor_label = QLabel()
+
+    def getCrossSectionRect(self, dialog):
+        paths = [
+            item for item in dialog.scene.items()
+            if isinstance(item, QGraphicsPathItem) and item.pen() == dialog.path_pen
+        ]
+        self.assertEqual(len(paths), 1)
+        return paths[0].path().boundingRect()
+
+    @mock.patch("sscanss.app.dialogs.insert.MeshPlaneSlicer", wraps=MeshPlaneSlicer)
+    def testCrossSection(self, slicer_mock):
+        dialog = PickPointDialog(self.view)
+        self.assertEqual(slicer_mock.call_count, 1)
+        slicer = dialog.slicer
+        rect = self.getCrossSectionRect(dialog)
+
+        dialog.updateCrossSection()
+        self.assertEqual(slicer_mock.call_count, 1)
+        self.assertIs(dialog.slicer, slicer)
+        self.assertEqual(self.getCrossSectionRect(dialog), rect)
+
+        # translating the sample rebinds the vertices so the slicer must be rebuilt
+        offset = np.cross(dialog.plane.normal, [1.0, 2.0, 3.0])
+        self.mesh.translate(offset)
+        dialog.updateCrossSection()
+        self.assertEqual(slicer_mock.call_count, 2)
+        self.assertIsNot(dialog.slicer, slicer)
+        self.assertIs(dialog.slicer.vertices, self.mesh.vertices)
+        new_rect = self.getCrossSectionRect(dialog)
+        shift = dialog.sample_scale * (offset @ dialog.matrix)
+        self.assertAlmostEqual(new_rect.width(), rect.width(), 3)
+        self.assertAlmostEqual(new_rect.height(), rect.height(), 3)
+        self.assertAlmostEqual(new_rect.center().x() - rect.center().x(), shift[0], 3)
+        self.assertAlmostEqual(new_rect.center().y() - rect.center().y(), shift[1], 3)
+
+
 class TestProgressDialog(unittest.TestCase):
     @mock.patch("sscanss.app.dialogs.misc.ProgressReport", autospec=True)
     def setUp(self, report_mock):